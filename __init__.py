@@ -40,25 +40,64 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import subprocess
-
+from datetime import datetime
+from functools import wraps
 from os.path import isfile, join, dirname
+from threading import Event, Lock, RLock, Thread, Timer
+from time import monotonic
+from typing import Optional, Tuple
 from adapt.intent import IntentBuilder
 from mycroft_bus_client import Message
 from neon_utils.message_utils import request_from_mobile
 from neon_utils.skills.neon_skill import NeonSkill, LOG
 from ovos_utils import resolve_resource_file
 
-from mycroft.audio import wait_while_speaking
-from mycroft.skills.core import intent_handler
+from .util.ambient import AlsaCaptureSource, AmbientLevelMeter, AmbientMonitor, \
+    AutoVolumeController
+from .util.backends import VolumeBackend, AlsaBackend, BusBackend, PulseStreamMixer, ShellBackend
+from .util.dedup import RequestDeduplicator
+from .util.feedback_cache import FeedbackCache
+from .util.level_cache import LevelCache
+from .util.level_map import LevelMap, MappedBackend
+from .util.level_parser import VolumeLevelParser, load_parsers
+from .util.metrics import InstrumentedBackend, VolumeMetrics, timed
+from .util.profiles import VolumeProfiles
+from .util.ramp import VolumeRamper, ramp_levels
+from .util.scheduler import VolumeChangeScheduler
+from .util.state_store import VolumeStateStore
+from .util.timers import VolumeTimers
+
+
+def skip_duplicate_requests(func):
+    """
+    Decorator for intent handlers that ignores server requests with a
+    `request_id` that was already handled successfully or is being handled
+    """
+    @wraps(func)
+    def wrapper(self, message):
+        request_id = (message.context.get("klat_data") or {}).get("request_id")
+        if not self.server or not request_id:
+            return func(self, message)
+        if not self._handled_requests.add(request_id):
+            LOG.info(f"Ignoring duplicate request: {request_id}")
+            return
+        try:
+            return func(self, message)
+        except Exception:
+            # Allow a retry of a request that failed
+            self._handled_requests.discard(request_id)
+            raise
+    return wrapper
 
 
 class VolumeSkill(NeonSkill):
 
     MIN_LEVEL = 0
     MAX_LEVEL = 100
+    # Streams with levels relative to output; names match vocab files
+    STREAMS = ("voice", "media", "alerts")
 
-    # TODO: Translation layer (have to match word in Level.voc)
+    # Levels for the last three (quiet, normal, loud) entries in each Level.voc
     VOLUME_WORDS = {
         'loud': 90,
         'normal': 60,
@@ -66,61 +105,208 @@ class VolumeSkill(NeonSkill):
     }
 
     def __init__(self):
+        init_start = monotonic()
         super(VolumeSkill, self).__init__("VolumeSkill")
-        self.settings["default_level"] = 60  # can be 0 (off) to 100 (max)
-        self.default_level = self.settings.get("default_level", 60)
+        # Output level for requests without a recognized level, can be 0 (off) to 100 (max)
+        self.default_level = int(self.settings.get("default_level", 60))
         self.settings["min_volume"] = 0     # can be 0 to 100
         if self.config_core['enclosure'].get('platform') == 'mycroft_mark_1':
             self.settings["max_volume"] = 83   # can be 0 to 83
         else:
             self.settings["max_volume"] = 100   # can be 0 to 100
         self.volume_sound = join(dirname(__file__), "blop-mark-diangelo.wav")
-        self.vol_before_mute = None
-        self._mixer = None
+        self._state = VolumeStateStore(join(self.file_system.path, "volume_state.json"))
+        self.vol_before_mute = self._state.get("output_before_mute")
+        self.mic_before_mute = self._state.get("input_before_mute")
+        self.vol_before_duck = None
+        self._muted = {io: self._state.get(f"{io}_muted", False)
+                       for io in ("input", "output") + self.STREAMS}
+        self._stream_levels = {stream: self._state.get(f"{stream}_level", self.MAX_LEVEL)
+                               for stream in self.STREAMS}
+        self._level_cache = LevelCache(float(self.settings.get("volume_cache_ttl", 30)))
+        self._scheduler = None
+        self._ramper = None
+        self._timers = None
+        self._stream_mixer = None
+        self._ambient = None
+        self._auto_volume_config = None
+        self._auto_boost = self._state.get("auto_volume_boost", 0)
+        self._level_parsers = dict()
+        self._pending_mute = None
+        self._handled_requests = RequestDeduplicator()
+        self._io_locks = {io: RLock() for io in ("input", "output") + self.STREAMS}
+        self._profiles = VolumeProfiles()
+        self._media_playing = False
+        self._feedback_cache = FeedbackCache(join(self.file_system.path, "feedback_cache"))
+        self._mute_lock = Lock()
+        self._metrics = VolumeMetrics(str(self.settings.get("metrics_enabled", False)).lower() == "true")
 
-        try:
-            self.default_level = self.local_config["devVars"]["defaultMicVolume"]
-        except KeyError:
-            self.default_level = 100
-            # self.create_signal("NGI_YAML_config_update")
-            self.local_config.update_yaml_file("devVars", "defaultMicVolume", self.default_level)
+        self.default_mic_level = self.local_config.get("devVars", {}).get("defaultMicVolume", 100)
 
-        self.min_volume = 0
-        self.max_volume = 100
+        self.min_volume = self.settings["min_volume"]
+        self.max_volume = self.settings["max_volume"]
         # self.mic_options = ["mic", "microphone", "input"]
 
         # TODO: Depreciate mic/vol levels and use API
-        # Populate current volume levels
-        if not self.server and isfile(join(self.local_config["dirVars"].get("ngiDir", ""), "functions.sh")):
+        # Provisional levels until the mixer is probed in `initialize`
+        self._mixer = None
+        self._levels_probed = Event()
+        # Saved levels are applied once core is ready; until then (and after a reload,
+        # when core is already ready) the mixer is probed for the actual levels
+        saved_mic = self._state.get("input_level")
+        saved_vol = self._state.get("output_level")
+        self.mic_level = saved_mic if saved_mic is not None else self.default_mic_level
+        self.vol_level = saved_vol if saved_vol is not None else self.default_level
+        LOG.debug(f"Constructed in {round(1000 * (monotonic() - init_start), 1)}ms")
+
+    def _probe_levels(self):
+        """
+        Reads current levels from the mixer without blocking skill load
+        """
+        start = monotonic()
+        if "defaultMicVolume" not in self.local_config.get("devVars", {}):
+            # self.create_signal("NGI_YAML_config_update")
+            self.local_config.update_yaml_file("devVars", "defaultMicVolume", self.default_mic_level)
+        try:
+            mic_level, vol_level = self._mixer.get_levels()
+            # Don't overwrite levels set while probing
+            if not self._level_cache.is_fresh("input"):
+                self.mic_level = mic_level
+                self._level_cache.update("input", mic_level)
+            if not self._level_cache.is_fresh("output"):
+                self.vol_level = vol_level
+                self._level_cache.update("output", vol_level)
+        except Exception as e:
+            LOG.error(e)
+        finally:
+            self._levels_probed.set()
+        LOG.debug(f"Levels probed in {round(1000 * (monotonic() - start), 1)}ms")
+
+    def _init_local_backend(self) -> Optional[VolumeBackend]:
+        """
+        Selects a backend to control audio levels on this device
+        :returns: VolumeBackend for local hardware, None to use the message bus
+        """
+        ngi_dir = self.local_config["dirVars"].get("ngiDir", "")
+        enclosure = self.local_config.get("devVars", {}).get("devType") or "generic"
+        if enclosure not in ("generic", "neonK", "neonX", "neonAlpha", "neonU") or \
+                not isfile(join(ngi_dir, "functions.sh")):
+            return None
+        backend = self.settings.get("mixer_backend", "auto")
+        if backend in ("auto", "alsa"):
             try:
-                subprocess.call(['bash', '-c', ". " + self.local_config["dirVars"]["ngiDir"]
-                                 + "/functions.sh; getLevel"])
-                self.mic_level = int(open(self.local_config["dirVars"]["tempDir"] + "/input_volume").read())
-                self.vol_level = int(open(self.local_config["dirVars"]["tempDir"] + "/output_volume").read())
+                return AlsaBackend()
             except Exception as e:
-                LOG.error(e)
-                self.mic_level = 0
-                self.vol_level = 0
-        else:
-            self.mic_level = 0
-            self.vol_level = 0
+                LOG.warning(f"Native mixer unavailable, falling back to functions.sh: {e}")
+        return ShellBackend(ngi_dir, self.local_config["dirVars"]["tempDir"])
+
+    def _init_input_mixer(self) -> Optional[VolumeBackend]:
+        """
+        Gets a backend to control microphone gain on enclosures without functions.sh
+        :returns: VolumeBackend for input, None if not available
+        """
+        if self.settings.get("mixer_backend", "auto") not in ("auto", "alsa"):
+            return None
+        try:
+            return AlsaBackend(output_control=None)
+        except Exception as e:
+            LOG.warning(f"No input mixer available: {e}")
+            return None
+
+    @staticmethod
+    def _init_stream_mixer() -> Optional[PulseStreamMixer]:
+        """
+        Gets a mixer to apply voice, media and alert levels with
+        :returns: PulseStreamMixer, None if not available
+        """
+        try:
+            return PulseStreamMixer()
+        except Exception as e:
+            LOG.info(f"Stream volume controls not available: {e}")
+            return None
+
+    def _volume_intent(self, name: str) -> IntentBuilder:
+        """
+        Starts building a volume intent that may refer to the microphone or, if streams
+        can be applied, to a stream
+        :param name: intent name
+        :returns: IntentBuilder requiring `Volume`
+        """
+        builder = IntentBuilder(name).require("Volume").optionally("Mic")
+        if self._stream_mixer:
+            for stream in self.STREAMS:
+                builder = builder.optionally(stream.capitalize())
+        return builder
 
     def initialize(self):
-        intent = IntentBuilder("IncreaseVolume").require("Volume").optionally("Mic").require("Increase").build()
+        self._mixer = None if self.server else self._init_local_backend()
+        probe = bool(self._mixer)
+        if not self._mixer:
+            self._mixer = BusBackend(self.bus, input_mixer=None if self.server else
+                                     self._init_input_mixer())
+            self._levels_probed.set()
+        self._mixer = MappedBackend(self._mixer, self._build_level_map())
+        if self._metrics.enabled:
+            self._mixer = InstrumentedBackend(self._mixer, self._metrics)
+        if probe and not self._levels_probed.is_set():
+            Thread(target=self._probe_levels, name="VolumeProbe", daemon=True).start()
+        self._level_parsers = load_parsers(dirname(__file__), (self.VOLUME_WORDS['quiet'],
+                                                              self.VOLUME_WORDS['normal'],
+                                                              self.VOLUME_WORDS['loud']), self.MAX_LEVEL)
+        self._load_profiles()
+        self.settings_change_callback = self._on_settings_changed
+        self._ramper = VolumeRamper(self._mixer.set_level)
+        self._scheduler = VolumeChangeScheduler(self._get_level, self.set_volume,
+                                                float(self.settings.get("volume_change_window", 0.1)),
+                                                self.MIN_LEVEL, self.MAX_LEVEL)
+        self._timers = VolumeTimers(self._on_timer_expired, self._state.touch,
+                                    self._state.get("timers", []))
+        self._state.set_provider("timers", self._timers.get_timers)
+        if not self.server:
+            self._stream_mixer = self._init_stream_mixer()
+        intent = self._volume_intent("IncreaseVolume").require("Increase").build()
         self.register_intent(intent, self.handle_increase_volume)
 
-        intent = IntentBuilder("DecreaseVolume").require("Volume").optionally("Mic").require("Decrease").build()
+        intent = self._volume_intent("DecreaseVolume").require("Decrease").build()
         self.register_intent(intent, self.handle_decrease_volume)
 
-        intent = IntentBuilder("MuteVolume").require("Mute").require("Volume").optionally("Mic").\
-            optionally("time").build()
+        intent = self._volume_intent("MuteVolume").require("Mute").optionally("time").build()
         self.register_intent(intent, self.handle_mute_volume)
 
-        intent = IntentBuilder("UnmuteVolume").require("Volume").optionally("Mic").require("Unmute").build()
+        intent = self._volume_intent("UnmuteVolume").require("Unmute").build()
         self.register_intent(intent, self.handle_unmute_volume)
 
-        if not self.server:
+        intent = self._volume_intent("SetVolume").optionally("Set").require("Level").build()
+        self.register_intent(intent, self.handle_set_volume)
+
+        intent = self._volume_intent("QueryVolume").require("Query").build()
+        self.register_intent(intent, self.handle_query_volume)
+
+        self.add_event("neon.volume.metrics", self.handle_get_metrics)
+        self.add_event("neon.volume.get_state", self.handle_get_volume_state)
+        self.add_event("neon.volume.set_streams", self.handle_set_streams)
+        if self.server:
+            self.add_event("neon.volume.batch", self.handle_batch_audio_control)
+        else:
             self.bus.once("mycroft.ready", self._unmute_on_loaded)
+            self.add_event("mycroft.volume.set", self._on_external_volume_change)
+            self.add_event("mycroft.volume.mute", self._on_external_volume_change)
+            self.add_event("mycroft.volume.increase", self._on_external_volume_change)
+            self.add_event("mycroft.volume.decrease", self._on_external_volume_change)
+            self.add_event("recognizer_loop:wakeword", self._duck_volume)
+            self.add_event("recognizer_loop:record_begin", self._duck_volume)
+            self.add_event("recognizer_loop:record_end", self._unduck_volume)
+            for msg_type in ("mycroft.audio.service.play", "mycroft.audio.service.resume",
+                             "mycroft.audio.service.pause", "mycroft.audio.service.stop",
+                             "mycroft.audio.queue_end"):
+                self.add_event(msg_type, self._on_media_state)
+            for msg_type in ("recognizer_loop:audio_output_start", "recognizer_loop:audio_output_end",
+                             "recognizer_loop:record_begin", "recognizer_loop:record_end"):
+                self.add_event(msg_type, self._on_ambient_interference)
+            if self.auto_volume_enabled:
+                self._start_auto_volume()
+            elif self._auto_boost:
+                self._apply_auto_boost(0)
 
     def _unmute_on_loaded(self, message):
         # TODO: Notify should probably go in a different skill DM
@@ -128,57 +314,178 @@ class VolumeSkill(NeonSkill):
         notify_file = resolve_resource_file(self.local_config["fileVars"]["notify"])
         if notify_file:
             play_wav(notify_file)
+        self._restore_saved_levels()
         self.set_volume(io='input', setting=-1, speak=False)
 
+    def _restore_saved_levels(self):
+        """
+        Applies levels and mute state persisted before the last shutdown
+        """
+        try:
+            for io in ('input', 'output'):
+                level = self._state.get(f"{io}_level")
+                if level is None:
+                    continue
+                with self._io_locks[io]:
+                    self._mixer.set_level(io, level)
+                    if io == 'output' and self._muted[io]:
+                        self._mixer.set_level(io, 0)
+                    if io == 'input':
+                        self.mic_level = level
+                    else:
+                        self.vol_level = level
+                    self._level_cache.update(io, level)
+            self._apply_stream_levels(dict())
+        except Exception as e:
+            LOG.error(f"Failed to restore volume: {e}")
+
+    @property
+    def ducking_enabled(self) -> bool:
+        return str(self.settings.get("ducking", True)).lower() == "true"
+
+    def _duck_volume(self, message):
+        """
+        Lowers output volume while the user is speaking
+        """
+        if not self.ducking_enabled:
+            return
+        with self._io_locks['output']:
+            if self.vol_before_duck is not None or self._muted["output"]:
+                return
+            # Use the known level; querying the backend here would delay the duck
+            level = self._ramper.current_level('output') if self._ramper else None
+            if level is None:
+                level = self.vol_level
+            ducked_level = round(level * float(self.settings.get("duck_level", 0.3)))
+            if ducked_level >= level:
+                return
+            # Restore the target of any fade in progress, not its current step
+            self.vol_before_duck = self.vol_level
+            if self._ramper:
+                self._ramper.cancel('output')
+            # Level 0 would mute the output
+            self._mixer.set_level('output', max(ducked_level, 1))
+
+    def _unduck_volume(self, message):
+        """
+        Restores the output volume from before ducking
+        """
+        with self._io_locks['output']:
+            if self.vol_before_duck is None:
+                return
+            level = self.vol_before_duck
+            self.vol_before_duck = None
+            if not self._muted["output"]:
+                self._mixer.set_level('output', level)
+
+    def _on_external_volume_change(self, message):
+        """
+        Keeps the level cache in sync with volume changes made outside of this skill
+        """
+        if message.context.get("origin") == "volume.neon":
+            return
+        if message.msg_type == "mycroft.volume.set" and \
+                isinstance(message.data.get("percent"), (int, float)):
+            # The message has a hardware volume; cache it as a level like MappedBackend reports
+            level = BusBackend.parse_percent(message)
+            mapped = self._get_mapped_backend()
+            self._level_cache.update("output", mapped.level_map.to_level(level) if mapped else level)
+        else:
+            self._level_cache.invalidate("output")
+
+    def handle_get_metrics(self, message):
+        """
+        Responds with timing metrics for volume operations
+        """
+        if message.data.get("reset"):
+            self._metrics.reset()
+        self.bus.emit(message.response(self._metrics.snapshot()))
+
     # Queries current volume and imports as mic_level and vol_level
+    @timed("get_volume")
     def _get_volume(self):
         """
         Populates self.mic_level and self.vol_level with current OS values
         """
-        enclosure = self.local_config.get("devVars", {}).get("devType") or "generic"
-        if enclosure in ("generic", "neonK", "neonX", "neonAlpha", "neonU") and\
-                isfile(join(self.local_config["dirVars"].get("ngiDir", ""), "functions.sh")):
-            subprocess.call(['bash', '-c', ". " + self.local_config["dirVars"]["ngiDir"]
-                            + "/functions.sh; getLevel; exit"])
-            LOG.debug("Volume Updated")
-            self.mic_level = int(open(self.local_config["dirVars"]["tempDir"] + "/input_volume").read())
-            self.vol_level = int(open(self.local_config["dirVars"]["tempDir"] + "/output_volume").read())
-        else:
-            self.mic_level = 100
-            vol_response = self.bus.wait_for_response(Message("mycroft.volume.get"))
-            if not vol_response:
-                raise Exception("No response from enclosure module!")
-            vol_percent = vol_response.data.get("percent")
-            if isinstance(vol_percent, int):
-                self.vol_level = vol_percent
-            elif isinstance(vol_percent, float):
-                self.vol_level = round(100 * vol_percent)
-            else:
-                LOG.error(vol_response)
-                self.vol_level = 0
+        if not self._levels_probed.is_set():
+            # Use provisional levels rather than wait on the probe
+            return
+        mic_level = self._level_cache.get("input")
+        vol_level = self._level_cache.get("output")
+        if mic_level is not None and vol_level is not None:
+            self._metrics.count("level_cache.hit")
+            self.mic_level = mic_level
+            self.vol_level = vol_level
+            return
+        self._metrics.count("level_cache.miss")
+        self.mic_level, self.vol_level = self._mixer.get_levels()
+        self._level_cache.update("input", self.mic_level)
+        self._level_cache.update("output", self.vol_level)
+
+    def _get_level(self, io: str) -> int:
+        """
+        Gets the current level of io
+        :param io: "input", "output" or a stream in STREAMS
+        :returns: current level (0-100)
+        """
+        if str(io) not in self.STREAMS:
+            self._get_volume()
+        return self._get_known_level(io)
 
-    def set_volume(self, io: str, setting, speak: bool = True):
+    def _get_known_level(self, io: str) -> int:
+        """
+        Gets the last known level of io without querying the OS
+        :param io: "input", "output" or a stream in STREAMS
+        """
+        if str(io) == 'input':
+            return self.mic_level
+        elif str(io) in self.STREAMS:
+            return self._stream_levels[str(io)]
+        return self.vol_level
+
+    @staticmethod
+    def _get_requested_io(message) -> str:
+        """
+        Gets the io a request refers to
+        :param message: Message associated with request
+        :returns: "input", "output" or a stream in STREAMS
+        """
+        if message.data.get("Mic"):
+            return 'input'
+        for stream in VolumeSkill.STREAMS:
+            if message.data.get(stream.capitalize()):
+                return stream
+        return 'output'
+
+    @staticmethod
+    def _get_io_kind(io: str) -> str:
+        """
+        Gets the spoken name of io for dialogs
+        """
+        if str(io) == 'input':
+            return "Microphone Level"
+        elif str(io) in VolumeSkill.STREAMS:
+            return f"{str(io).capitalize()} Volume"
+        return "Volume"
+
+    @timed("set_volume")
+    def set_volume(self, io: str, setting, speak: bool = True, message=None):
         """
         Sets level of io to setting
-        :param io: "input" or "output"
+        :param io: "input", "output" or a stream in STREAMS
         :param setting: (0-100) (-1 for unmute)
         :param speak: boolean to speak confirmation of volume change
+        :param message: Message associated with request, used for user preferences
         """
-        enclosure = self.local_config.get("devVars", {}).get("devType") or "generic"
-        if enclosure in ("generic", "neonK", "neonX", "neonAlpha", "neonU") and\
-                isfile(join(self.local_config["dirVars"].get("ngiDir", ""), "functions.sh")):
-            subprocess.Popen(['bash', '-c', ". " + self.local_config["dirVars"]["ngiDir"]
-                              + "/functions.sh; setLevel " + str(io) + " " + str(setting)])
-        else:
-            if str(io) == "input":
-                LOG.warning(f"Input controls not implemented!")
-            else:
-                if str(setting) == '0':
-                    self.bus.emit(Message("mycroft.volume.mute", {"mute": True}, {"origin": "volume.neon"}))
-                elif str(setting) == '-1':
-                    self.bus.emit(Message("mycroft.volume.mute", {"mute": False}, {"origin": "volume.neon"}))
-                else:
-                    self.bus.emit(Message("mycroft.volume.set", {"percent": setting/100}, {"origin": "volume.neon"}))
+        if str(setting) != '0':
+            # A newer change replaces a mute waiting on speech to finish
+            self._cancel_pending_mute()
+        with self._io_locks[str(io)]:
+            old_level = self._get_known_level(io)
+            was_muted = self._muted.get(str(io))
+            self._apply_level(io, setting)
+            self._update_cached_level(io, setting)
+        self._emit_volume_changed(io, old_level, was_muted, message)
         if str(setting) == '0':
             if str(io) == 'input':
                 pass
@@ -188,25 +495,256 @@ class VolumeSkill(NeonSkill):
                 kind = "Volume"
                 volume = str(self.vol_level)
                 # self.speak("Volume restored to " + str(self.vol_level) + ".", private=True)
+            elif str(io) in self.STREAMS:
+                kind = self._get_io_kind(io)
+                volume = str(self._get_known_level(io))
             else:
                 kind = "Microphone level"
                 volume = self.mic_level
                 # self.speak("Microphone restored to " + str(self.mic_level) + ".", private=True)
             if speak:
-                self.speak_dialog("reset.volume", {"kind": kind, "volume": volume}, private=True)
+                self._speak_feedback("reset.volume", {"kind": kind, "volume": volume}, message)
         else:
             if str(io) == 'output':
                 kind = "Volume"
                 # self.speak("Volume set to " + str(setting) + " percent.", private=True)
+            elif str(io) in self.STREAMS:
+                kind = self._get_io_kind(io)
             else:
                 kind = "Microphone Level"
                 # self.speak("Microphone level set to " + str(setting) + " percent.", private=True)
             if speak:
-                self.speak_dialog("set.volume", {"kind": kind, "volume": str(setting)}, private=True)
+                self._speak_feedback("set.volume", {"kind": kind, "volume": str(setting)}, message)
+
+    def _get_volume_state(self) -> dict:
+        """
+        :returns: dict of known level and mute state for each io
+        """
+        return {io: {"level": self._get_known_level(io), "muted": self._muted[io]}
+                for io in ("input", "output") + self.STREAMS}
+
+    def _emit_volume_changed(self, io: str, old_level: int, was_muted: bool, message=None):
+        """
+        Notifies subscribers that set_volume changed the level or mute state of io
+        """
+        io = str(io)
+        new_level = self._get_known_level(io)
+        muted = self._muted[io]
+        if new_level == old_level and muted == was_muted:
+            return
+        origin = (message.context.get("client") if message else None) or "volume.neon"
+        self.bus.emit(Message("neon.volume.changed",
+                              {"io": io, "old_level": old_level, "new_level": new_level,
+                               "muted": muted, "origin": origin},
+                              {"origin": "volume.neon"}))
+
+    def handle_get_volume_state(self, message):
+        """
+        Responds with the current levels so new subscribers to `neon.volume.changed`
+        can start from a snapshot
+        """
+        self.bus.emit(message.response(self._get_volume_state()))
+
+    def _speak_feedback(self, dialog: str, data: dict, message=None):
+        """
+        Confirms a volume change according to the user's `volume_feedback` preference:
+        "speech" speaks the dialog, "sound" plays a short blip and "cached" plays the
+        dialog from audio rendered on first use
+        :param dialog: dialog to confirm with
+        :param data: dialog data
+        :param message: Message associated with request
+        """
+        from mycroft.util import play_wav
+        prefs = self.preference_skill(message) if message else self.settings
+        mode = prefs.get("volume_feedback", "speech")
+        if mode == "sound":
+            play_wav(self.volume_sound)
+            return
+        if mode == "cached":
+            lang = (message.data.get("lang") if message else None) or self.lang
+            key = self._feedback_cache.get_key(lang, dialog, data)
+            cached = self._feedback_cache.get(key)
+            if cached:
+                play_wav(cached)
+                return
+            if self._feedback_cache.claim(key):
+                Thread(target=self._render_feedback, args=(key, dialog, data),
+                       name="VolumeFeedback", daemon=True).start()
+        with self._metrics.timer("speak_dialog"):
+            self.speak_dialog(dialog, data, private=True)
+
+    def _render_feedback(self, key: str, dialog: str, data: dict):
+        """
+        Renders dialog audio with the TTS service and adds it to the feedback cache
+        """
+        audio_file = None
+        try:
+            text = self.dialog_renderer.render(dialog, data)
+            ident = f"volume.neon.{key}"
+            response = self.bus.wait_for_response(Message("neon.get_tts", {"text": text},
+                                                          {"ident": ident}), ident, timeout=30)
+            for lang_response in (response.data.values() if response else []):
+                if isinstance(lang_response, dict):
+                    audio_file = lang_response.get("female") or lang_response.get("male")
+                    break
+        except Exception as e:
+            LOG.error(f"Failed to render {dialog}: {e}")
+        self._feedback_cache.add(key, audio_file)
+
+    def _apply_level(self, io: str, setting):
+        """
+        Applies setting to io, fading output changes over the configured ramp duration
+        :param io: "input" or "output"
+        :param setting: (0-100) (0 for mute, -1 for unmute)
+        """
+        if str(io) in self.STREAMS:
+            self._apply_stream_levels({str(io): setting})
+            return
+        duration = float(self.settings.get("ramp_duration", 0.3))
+        if str(io) != 'output' or not duration or not self._ramper:
+            self._mixer.set_level(io, setting)
+            return
+        interval = self._mixer.min_step_interval
+        steps = max(int(duration / interval), 1)
+        curve = self.settings.get("ramp_curve", "db")
+        current = self._ramper.current_level(io)
+        if current is None:
+            current = self.vol_level
+        if str(setting) == '0':
+            if not self._mixer.can_set_muted_level:
+                # The faded level would remain after an unmute made outside this skill
+                self._ramper.cancel(io)
+                self._mixer.set_level(io, 0)
+                return
+
+            # Restore the target of any fade in progress, not its current step
+            restore_level = self.vol_level if self.vol_level > self.MIN_LEVEL else current
+
+            def _mute():
+                # Fade out, mute, then restore the level for an unmute made elsewhere
+                self._mixer.set_level(io, 0)
+                self._mixer.set_muted_level(io, restore_level)
+            self._ramper.start(io, ramp_levels(current, 1, steps, curve), interval, _mute)
+        elif str(setting) == '-1':
+            # Unmute at the lowest level, then fade in
+            self._ramper.cancel(io)
+            self._mixer.set_level(io, 1)
+            self._mixer.set_level(io, -1)
+            self._ramper.start(io, ramp_levels(1, self._get_unmute_level(io), steps, curve), interval)
+        else:
+            self._ramper.start(io, ramp_levels(current, int(setting), steps, curve), interval)
+
+    def _get_unmute_level(self, io: str) -> int:
+        """
+        Gets the level io returns to when unmuted
+        :param io: "input" or "output"
+        :returns: level from before muting, else the last known or default level
+        """
+        before_mute = self.mic_before_mute if str(io) == 'input' else self.vol_before_mute
+        if before_mute and before_mute > self.MIN_LEVEL:
+            return before_mute
+        level = self._get_known_level(io)
+        if level > self.MIN_LEVEL:
+            return level
+        return self.default_mic_level if str(io) == 'input' else self.default_level
 
-    @intent_handler(IntentBuilder("SetVolume").optionally("Set").require("Volume").require("Level"))
+    def _apply_stream_levels(self, settings: dict):
+        """
+        Applies settings for one or more streams in a single update. Stream levels are
+        relative to the output level and are saved as PulseAudio role volumes if available,
+        then published in `neon.volume.streams` for audio services to apply.
+        :param settings: dict of stream name to setting (0-100) (0 for mute, -1 for unmute)
+        """
+        streams = dict()
+        for stream in self.STREAMS:
+            level = self._stream_levels[stream]
+            muted = self._muted[stream]
+            setting = settings.get(stream)
+            if setting is not None:
+                if str(setting) in ('0', '-1'):
+                    muted = str(setting) == '0'
+                else:
+                    level = self.bound_level(int(setting))
+                    muted = False
+            streams[stream] = {"level": level, "muted": muted}
+        if self._stream_mixer:
+            try:
+                self._stream_mixer.set_streams(streams)
+            except Exception as e:
+                LOG.error(f"Failed to apply stream levels: {e}")
+        self.bus.emit(Message("neon.volume.streams", streams, {"origin": "volume.neon"}))
+
+    def handle_set_streams(self, message):
+        """
+        Sets levels for several streams in one update
+        :param message: Message with `streams`, a dict of stream name to setting
+        """
+        settings = {stream: setting for stream, setting in message.data.get("streams", {}).items()
+                    if stream in self.STREAMS and isinstance(setting, int)}
+        if not settings:
+            return
+        locks = [self._io_locks[stream] for stream in self.STREAMS if stream in settings]
+        for lock in locks:
+            lock.acquire()
+        try:
+            old_state = {stream: (self._stream_levels[stream], self._muted[stream])
+                         for stream in settings}
+            self._apply_stream_levels(settings)
+            for stream, setting in settings.items():
+                self._update_cached_level(stream, setting)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        for stream in settings:
+            self._emit_volume_changed(stream, *old_state[stream], message)
+
+    def _update_cached_level(self, io: str, setting):
+        """
+        Records a level applied by set_volume so it may be read back without querying the OS
+        :param io: "input", "output" or a stream in STREAMS
+        :param setting: (0-100) (-1 for unmute)
+        """
+        io = str(io)
+        if str(setting) == '0':
+            level = self._get_known_level(io)
+            # A muted mixer may report 0; keep the level from before the first mute
+            if not self._muted[io] and level > self.MIN_LEVEL:
+                if io == 'input':
+                    self.mic_before_mute = level
+                elif io == 'output':
+                    self.vol_before_mute = level
+                self._state.update(**{f"{io}_before_mute": level})
+            self._muted[io] = True
+            self._state.update(**{f"{io}_muted": True})
+            if io not in self.STREAMS:
+                # Level while muted is determined by the OS
+                self._level_cache.invalidate(io)
+            return
+        elif str(setting) == '-1':
+            self._muted[io] = False
+            self._state.update(**{f"{io}_muted": False})
+            if io in self.STREAMS:
+                return
+            setting = self._get_unmute_level(io)
+        self._muted[io] = False
+        level = self.bound_level(int(setting))
+        self._state.update(**{f"{io}_level": level, f"{io}_muted": False})
+        if io in self.STREAMS:
+            self._stream_levels[io] = level
+            return
+        self._level_cache.update(io, level)
+        if io == 'input':
+            self.mic_level = level
+        else:
+            self.vol_level = level
+            if self.vol_before_duck is not None:
+                # Don't revert an explicit change when ducking ends
+                self.vol_before_duck = level
+
+    @skip_duplicate_requests
     def handle_set_volume(self, message):
-        level = self.extract_spoken_volume_level(message, self._get_volume())
+        duration, message = self._strip_duration(message)
+        level = self.extract_spoken_volume_level(message)
         # LOG.info("Set Volume Intent")
 
         if request_from_mobile(message):
@@ -218,17 +756,20 @@ class VolumeSkill(NeonSkill):
             # self.socket_io_emit(event="audio control", kind="volume", message=level,
             #                     flac_filename=message.context["flac_filename"])
         else:
-            if message.data.get("Mic"):
-                self.set_volume(io='input', setting=level)
-                # LOG.info("in mic")
+            io = self._get_requested_io(message)
+            if duration:
+                self._schedule_revert(io, duration)
             else:
-                self.set_volume(io='output', setting=level)
+                # An explicit level replaces a timed change
+                self._timers.cancel(f"{io}.revert")
+            self._timers.cancel(f"{io}.unmute")
+            self._scheduler.submit(io, level=level, message=message)
         # if not self.check_for_signal("use_default_response", -1):
         #     self.speak_dialog('set.volume', data={'volume': level})
         # else:
         #     self.speak("Volume changed to {}".format(level))
 
-    @intent_handler(IntentBuilder("QueryVolume").require("Volume").require("Query"))
+    @skip_duplicate_requests
     def handle_query_volume(self, message):
         if request_from_mobile(message):
             # self.speak("MOBILE-INTENT VOLUME&query")
@@ -240,9 +781,13 @@ class VolumeSkill(NeonSkill):
             #                     flac_filename=message.context["flac_filename"])
         else:
             self._get_volume()
-            if message.data.get("Mic"):
+            io = self._get_requested_io(message)
+            if io == 'input':
                 level = self.mic_level
                 self.speak_dialog('volume.is', data={'kind': 'microphone', 'volume': level}, private=True)
+            elif io in self.STREAMS:
+                level = self._get_known_level(io)
+                self.speak_dialog('volume.is', data={'kind': f'{io} volume', 'volume': level}, private=True)
             else:
                 level = self.vol_level
                 if not self.check_for_signal("SKILLS_useDefaultResponses", -1):
@@ -250,6 +795,7 @@ class VolumeSkill(NeonSkill):
                 else:
                     self.speak("The volume is at {} percent.".format(level), private=True)
 
+    @skip_duplicate_requests
     def handle_increase_volume(self, message):
         if request_from_mobile(message):
             # self.speak("MOBILE-INTENT VOLUME&level=increase")
@@ -262,15 +808,88 @@ class VolumeSkill(NeonSkill):
             # self.socket_io_emit(event="audio control", kind="volume", message="increase",
             #                     flac_filename=message.context["flac_filename"])
         else:
-            if message.data.get("Mic"):
-                self.update_mic_volume(10)
+            duration, message = self._strip_duration(message)
+            io = self._get_requested_io(message)
+            if duration:
+                self._schedule_revert(io, duration)
+            if io == 'input':
+                self.update_mic_volume(self.extract_spoken_volume_change(message), message)
                 # LOG.info("in mic")
+            elif io in self.STREAMS:
+                self._scheduler.submit(io, delta=self.extract_spoken_volume_change(message),
+                                       message=message)
             else:
-                self.update_volume(10)
+                self.update_volume(self.extract_spoken_volume_change(message), message)
+
+    @staticmethod
+    def _build_audio_control(target: dict) -> list:
+        """
+        Builds an "audio control" payload for one server session
+        :param target: dict with `request_id`, `op` (set, delta, mute, unmute, query),
+                       optional `value` for set/delta and optional `mic` flag
+        :returns: payload in the format emitted by the single-request handlers
+        """
+        request_id = target["request_id"]
+        op = target.get("op")
+        value = target.get("value")
+        if op == "set":
+            return ["volume", VolumeSkill.bound_level(int(value)), request_id]
+        elif op == "delta":
+            if int(value) == 0:
+                raise ValueError("delta must not be 0")
+            # The server applies its own step size for relative changes
+            return ["volume", "increase" if int(value) > 0 else "decrease", request_id]
+        elif op == "query":
+            return ["volume", "query", request_id]
+        elif op in ("mute", "unmute"):
+            return ["microphone" if target.get("mic") else "speech", op == "unmute", request_id]
+        raise ValueError(f"Invalid op: {op}")
+
+    def handle_batch_audio_control(self, message):
+        """
+        Handles a request to change audio for many server sessions at once. All valid
+        targets are sent to the server in a single emit and results are returned by request_id.
+        :param message: Message with `targets`, a list of dicts accepted by `_build_audio_control`
+        """
+        payloads = list()
+        results = dict()
+        for target in message.data.get("targets", []):
+            try:
+                payload = self._build_audio_control(target)
+            except (KeyError, TypeError, ValueError) as e:
+                LOG.warning(f"Invalid target {target}: {e}")
+                if isinstance(target, dict) and target.get("request_id"):
+                    results.setdefault(target["request_id"], {"error": repr(e)})
+                continue
+            request_id = target["request_id"]
+            if not self._handled_requests.add(request_id):
+                # Keep the result of an earlier target with this ID in the same batch
+                results.setdefault(request_id, {"duplicate": True})
+                continue
+            payloads.append(payload)
+            results[request_id] = {"emitted": payload}
+        if payloads:
+            self.socket_emit_to_server("audio control batch", payloads)
+        self.bus.emit(message.response({"results": results}))
 
     def stop(self):
         pass
 
+    def shutdown(self):
+        self._cancel_pending_mute()
+        if self._scheduler:
+            self._scheduler.shutdown()
+        if self._ramper:
+            self._ramper.shutdown()
+        if self._timers:
+            self._timers.shutdown()
+        if self._ambient:
+            self._ambient.shutdown()
+        if self._mixer:
+            self._mixer.shutdown()
+        self._state.flush()
+
+    @skip_duplicate_requests
     def handle_decrease_volume(self, message):
         if request_from_mobile(message):
             # self.speak("MOBILE-INTENT VOLUME&level=decrease")
@@ -283,43 +902,61 @@ class VolumeSkill(NeonSkill):
             # self.socket_io_emit(event="audio control", kind="volume", message="decrease",
             #                     flac_filename=message.context["flac_filename"])
         else:
-            if message.data.get("Mic"):
-                self.update_mic_volume(-10)
+            duration, message = self._strip_duration(message)
+            io = self._get_requested_io(message)
+            if duration:
+                self._schedule_revert(io, duration)
+            if io == 'input':
+                self.update_mic_volume(-self.extract_spoken_volume_change(message), message)
                 # LOG.info("in mic")
+            elif io in self.STREAMS:
+                self._scheduler.submit(io, delta=-self.extract_spoken_volume_change(message),
+                                       message=message)
             # Output
             else:
-                self.update_volume(-10)
+                self.update_volume(-self.extract_spoken_volume_change(message), message)
 
+    @skip_duplicate_requests
     def handle_mute_volume(self, message):
         if message.data.get("Mic"):
             if request_from_mobile(message):
                 self.mobile_skill_intent("volume", {"state": "mute"}, message)
                 # self.socket_io_emit('microphone', '&state=mute', message.context["flac_filename"])
             elif self.server:
-                self.socket_emit_to_server("audio control",
-                                           ["microphone", False, message.context["klat_data"]["request_id"]])
+                request_id = message.context["klat_data"]["request_id"]
+                self.socket_emit_to_server("audio control", ["microphone", False, request_id])
                 # self.socket_io_emit(event="audio control", kind="microphone", message=False,
                 #                     flac_filename=message.context["flac_filename"])
+                self._schedule_unmute(message, request_id, ["microphone", True, request_id])
             else:
                 self.set_volume(io='input', setting=0)
+                self._schedule_unmute(message, 'input')
             self.speak_dialog('mute.volume', {"kind": "Microphone"}, private=True)
         else:
             speak_message = message.data.get('speak_message', True)
+            mute_local = not request_from_mobile(message) and not self.server
+            io = self._get_requested_io(message)
+            if speak_message and mute_local:
+                # Mute after the confirmation is spoken without blocking this thread
+                self._schedule_mute(io)
             if speak_message:
+                kind = io.capitalize() if io in self.STREAMS else "Audio"
                 # if not self.check_for_signal("use_default_response", -1):
-                self.speak_dialog('mute.volume', {"kind": "Audio"}, private=True)
+                self.speak_dialog('mute.volume', {"kind": kind}, private=True)
                 # else:
                 #     self.speak("Audio is going to be muted.", private=True)
-                wait_while_speaking()
             if request_from_mobile(message):
                 pass
             elif self.server:
-                self.socket_emit_to_server("audio control",
-                                           ["speech", False, message.context["klat_data"]["request_id"]])
+                request_id = message.context["klat_data"]["request_id"]
+                self.socket_emit_to_server("audio control", ["speech", False, request_id])
                 # self.socket_io_emit(event="audio control", kind="speech", message=False,
                 #                     flac_filename=message.context["flac_filename"])
+                self._schedule_unmute(message, request_id, ["speech", True, request_id])
             else:
-                self.set_volume(io='output', setting=0)
+                if not speak_message:
+                    self.set_volume(io=io, setting=0)
+                self._schedule_unmute(message, io)
 
         # if message.data.get("mobile"):
         #     # self.speak("MOBILE-INTENT VOLUME&level=mute")
@@ -355,6 +992,145 @@ class VolumeSkill(NeonSkill):
 
     # @intent_handler(IntentBuilder("UnmuteVolume").require(
     #    "Volume").require("Unmute"))
+    def _schedule_mute(self, io: str):
+        """
+        Mutes io when audio output ends, or after `mute_timeout` seconds if it never does
+        :param io: "input" or "output"
+        """
+        self._cancel_pending_mute()
+
+        def _mute(_=None):
+            with self._mute_lock:
+                if self._pending_mute is None or self._pending_mute[1] is not _mute:
+                    return
+            self._cancel_pending_mute()
+            self.set_volume(io=io, setting=0)
+
+        timer = Timer(float(self.settings.get("mute_timeout", 10)), _mute)
+        timer.daemon = True
+        with self._mute_lock:
+            self._pending_mute = (timer, _mute)
+        self.bus.once("recognizer_loop:audio_output_end", _mute)
+        timer.start()
+
+    def _schedule_unmute(self, message, target: str, server_payload: Optional[list] = None):
+        """
+        Schedules an unmute if a duration was requested (i.e. "mute for 10 minutes")
+        :param message: Message associated with the mute request
+        :param target: io locally or request_id on a server
+        :param server_payload: "audio control" data to emit on a server
+        """
+        duration = self._extract_duration(message)
+        timer_id = target if server_payload else f"{target}.unmute"
+        if not duration:
+            self._timers.cancel(timer_id)
+        elif server_payload:
+            self._timers.schedule(timer_id, duration, {"action": "server",
+                                                       "payload": server_payload})
+        else:
+            self._timers.schedule(timer_id, duration, {"action": "unmute", "io": target})
+
+    def _schedule_revert(self, io: str, duration: float):
+        """
+        Schedules io to return to its current level (i.e. "turn it down for 30 minutes").
+        A pending revert keeps its level, so consecutive timed changes return to the
+        level from before the first one.
+        :param io: "input", "output" or a stream in STREAMS
+        :param duration: seconds until the level is reverted
+        """
+        pending = self._timers.get(f"{io}.revert")
+        level = pending["data"]["level"] if pending else self._get_level(io)
+        self._timers.schedule(f"{io}.revert", duration, {"action": "set", "io": io, "level": level})
+
+    def _strip_duration(self, message) -> Tuple[Optional[float], Message]:
+        """
+        Removes a requested duration from message so it isn't parsed as a level or amount
+        :param message: Message associated with request
+        :returns: duration in seconds (or None), message without the duration
+        """
+        duration, remainder = self._split_duration(message)
+        if not duration:
+            return None, message
+        level_str = message.data.get("Level")
+        data = dict(message.data, utterance=remainder,
+                    Level=level_str if level_str and level_str in remainder else None)
+        return duration, message.forward(message.msg_type, data)
+
+    def _on_timer_expired(self, data: dict):
+        """
+        Handles a timed mute or volume change coming due
+        :param data: data passed to `VolumeTimers.schedule`
+        """
+        LOG.debug(f"Volume timer expired: {data}")
+        action = data.get("action")
+        if action == "unmute":
+            self.set_volume(io=data["io"], setting=-1, speak=False)
+        elif action == "set" and self._muted.get(data["io"]):
+            self._set_muted_level(data["io"], data["level"])
+        elif action == "set":
+            self.set_volume(io=data["io"], setting=data["level"], speak=False)
+        elif action == "server":
+            self.socket_emit_to_server("audio control", data["payload"])
+        else:
+            LOG.warning(f"Unknown timer action: {action}")
+
+    def _set_muted_level(self, io: str, level: int):
+        """
+        Changes the level a muted io returns to when unmuted, without unmuting it
+        :param io: "input", "output" or a stream in STREAMS
+        :param level: level (1-100)
+        """
+        with self._io_locks[io]:
+            level = self.bound_level(int(level))
+            if io in self.STREAMS:
+                self._stream_levels[io] = level
+                self._state.update(**{f"{io}_level": level})
+                return
+            if io == 'input':
+                self.mic_before_mute = level
+            else:
+                self.vol_before_mute = level
+            self._state.update(**{f"{io}_before_mute": level})
+
+    def _extract_duration(self, message) -> Optional[float]:
+        """
+        Extracts a requested duration (i.e. "for 10 minutes") from an utterance
+        :param message: Message associated with request
+        :returns: duration in seconds, or None if no duration was requested
+        """
+        return self._split_duration(message)[0]
+
+    def _split_duration(self, message) -> Tuple[Optional[float], str]:
+        """
+        Splits a requested duration from the rest of an utterance
+        :param message: Message associated with request
+        :returns: duration in seconds (or None), utterance without the duration
+        """
+        from mycroft.util.parse import extract_duration
+        utterance = message.data.get("utterance") or ""
+        if not utterance:
+            return None, utterance
+        try:
+            duration = extract_duration(utterance, message.data.get("lang", self.lang))
+        except Exception as e:
+            LOG.warning(f"Failed to extract duration from: {utterance} ({e})")
+            return None, utterance
+        if not duration or not duration[0]:
+            return None, utterance
+        return duration[0].total_seconds(), duration[1]
+
+    def _cancel_pending_mute(self):
+        """
+        Cancels a mute scheduled by `_schedule_mute`
+        """
+        with self._mute_lock:
+            pending, self._pending_mute = self._pending_mute, None
+        if pending:
+            timer, handler = pending
+            timer.cancel()
+            self.bus.remove("recognizer_loop:audio_output_end", handler)
+
+    @skip_duplicate_requests
     def handle_unmute_volume(self, message):
         if message.data.get("Mic"):
             if request_from_mobile(message):
@@ -367,7 +1143,8 @@ class VolumeSkill(NeonSkill):
                 #                     flac_filename=message.context["flac_filename"])
                 self.speak("Microphone listening.", private=True)
             else:
-                self.set_volume(io='input', setting=-1)
+                self._timers.cancel("input.unmute")
+                self.set_volume(io='input', setting=-1, message=message)
         else:
             if request_from_mobile(message):
                 self.speak("Unmuting volume.", private=True)
@@ -380,7 +1157,9 @@ class VolumeSkill(NeonSkill):
                 # self.socket_io_emit(event="audio control", kind="speech", message=True,
                 #                     flac_filename=message.context["flac_filename"])
             else:
-                self.set_volume(io='output', setting=-1)
+                io = self._get_requested_io(message)
+                self._timers.cancel(f"{io}.unmute")
+                self.set_volume(io=io, setting=-1, message=message)
 
         # if message.data.get("mobile"):
         #     # self.speak("MOBILE-INTENT VOLUME&level=unmute")
@@ -411,39 +1190,6 @@ class VolumeSkill(NeonSkill):
         #         #     else:
         #         #         self.speak("Volume restored to {}".format(self.default_level))
 
-    # def volume_to_level(self, volume):
-    #     """
-    #     Convert a 'volume' to a 'level'
-    #
-    #     Args:
-    #         volume (int): min_volume..max_volume
-    #     Returns:
-    #         int: the equivalent level
-    #     """
-    #     range_volume = self.MAX_LEVEL - self.MIN_LEVEL
-    #     prop = float(volume - self.min_volume) / self.max_volume
-    #     level = int(round(self.MIN_LEVEL + range_volume * prop))
-    #     if level > self.MAX_LEVEL:
-    #         level = self.MAX_LEVEL
-    #     elif level < self.MIN_LEVEL:
-    #         level = self.MIN_LEVEL
-    #     return level
-
-    # def __level_to_volume(self, level):
-    #     """
-    #     Convert a 'level' to a 'volume'
-    #
-    #     Args:
-    #         level (int): 0..MAX_LEVEL
-    #     Returns:
-    #         int: the equivalent volume
-    #     """
-    #     range = self.max_volume - self.min_volume
-    #     prop = float(level) / self.MAX_LEVEL
-    #     volume = int(round(self.min_volume + int(range) * prop))
-
-        # return volume
-
     @staticmethod
     def bound_level(level):
         if level > VolumeSkill.MAX_LEVEL:
@@ -452,38 +1198,193 @@ class VolumeSkill(NeonSkill):
             level = VolumeSkill.MIN_LEVEL
         return level
 
-    def update_volume(self, change=0):
-        self._get_volume()
-        old_level = self.vol_level
-        new_level = self.bound_level(old_level + change)
+    def update_volume(self, change=0, message=None):
+        """
+        Changes the output level by change without waiting for it to be applied
+        """
+        self._scheduler.submit('output', delta=change, message=message)
         # self.enclosure.eyes_volume(new_level)
-        self.set_volume(io='output', setting=new_level)
-        return new_level, new_level != old_level
 
-    def update_mic_volume(self, change=0):
-        self._get_volume()
-        old_level = self.mic_level
-        new_level = self.bound_level(old_level + change)
+    def update_mic_volume(self, change=0, message=None):
+        """
+        Changes the input level by change without waiting for it to be applied
+        """
+        self._scheduler.submit('input', delta=change, message=message)
         # self.enclosure.eyes_volume(new_level)
-        self.set_volume(io='input', setting=new_level)
-        return new_level, new_level != old_level
+
+    def _get_level_parser(self, message) -> Optional[VolumeLevelParser]:
+        """
+        Gets the level parser for the language of message
+        """
+        lang = (message.data.get("lang") or self.lang or "en-us").lower()
+        return self._level_parsers.get(lang) or self._level_parsers.get(self.lang) or \
+            self._level_parsers.get("en-us")
+
+    def _load_profiles(self):
+        """
+        Rebuilds the volume profile index from settings
+        """
+        base = {"quiet": self.VOLUME_WORDS['quiet'],
+                "normal": self.VOLUME_WORDS['normal'],
+                "loud": self.VOLUME_WORDS['loud'],
+                "default_level": self.default_level,
+                "offset": 0}
+        self._profiles.load(self.settings.get("volume_profiles") or [], base)
+
+    def _build_level_map(self) -> LevelMap:
+        """
+        Builds the level to hardware volume map for the configured taper and volume range
+        """
+        return LevelMap(self.min_volume, self.max_volume,
+                        self.settings.get("volume_taper", "linear"),
+                        float(self.settings.get("taper_db_range", 30)))
+
+    def _get_mapped_backend(self) -> Optional[MappedBackend]:
+        """
+        :returns: the MappedBackend converting levels for the mixer, if any
+        """
+        mapped = self._mixer.backend if isinstance(self._mixer, InstrumentedBackend) else self._mixer
+        return mapped if isinstance(mapped, MappedBackend) else None
+
+    def _on_settings_changed(self):
+        self.default_level = int(self.settings.get("default_level", 60))
+        self._load_profiles()
+        mapped = self._get_mapped_backend()
+        if mapped:
+            mapped.level_map = self._build_level_map()
+        if not self.server and self._auto_volume_config != self._get_auto_volume_config():
+            self._stop_auto_volume()
+            if self.auto_volume_enabled:
+                self._start_auto_volume()
+
+    def _on_media_state(self, message):
+        self._media_playing = message.msg_type in ("mycroft.audio.service.play",
+                                                   "mycroft.audio.service.resume")
+        ambient = self._ambient
+        if ambient:
+            # Playback would be measured as ambient noise
+            if self._media_playing:
+                ambient.pause("media")
+            else:
+                ambient.resume("media")
+
+    @property
+    def auto_volume_enabled(self) -> bool:
+        return str(self.settings.get("auto_volume", False)).lower() == "true"
+
+    def _get_auto_volume_config(self) -> Optional[tuple]:
+        if not self.auto_volume_enabled:
+            return None
+        return (self.settings.get("auto_volume_device", "default"),
+                self.settings.get("auto_volume_max_boost", 30),
+                self.settings.get("auto_volume_interval", 5))
+
+    def _start_auto_volume(self):
+        """
+        Starts adjusting output volume to ambient noise measured at the microphone
+        """
+        self._auto_volume_config = self._get_auto_volume_config()
+        try:
+            meter = AmbientLevelMeter()
+            source = AlsaCaptureSource(self.settings.get("auto_volume_device", "default"),
+                                       frame_size=meter.frame_size)
+        except Exception as e:
+            LOG.warning(f"Auto volume unavailable: {e}")
+            return
+        controller = AutoVolumeController(self._apply_auto_boost,
+                                          max_boost=int(self.settings.get("auto_volume_max_boost", 30)),
+                                          min_interval=float(self.settings.get("auto_volume_interval", 5)))
+        # Keep any boost applied before a reload so it is not applied twice
+        controller.boost = self._auto_boost
+        self._ambient = AmbientMonitor(source.read, meter, controller, on_stopped=source.close)
+        if self._media_playing:
+            self._ambient.pause("media")
+        self._ambient.start()
+
+    def _stop_auto_volume(self):
+        """
+        Stops auto volume and removes any boost it applied
+        """
+        self._auto_volume_config = None
+        ambient, self._ambient = self._ambient, None
+        if ambient:
+            ambient.shutdown()
+            self._apply_auto_boost(0)
+
+    def _on_ambient_interference(self, message):
+        """
+        Pauses ambient measurement while Neon or the user is speaking
+        """
+        ambient = self._ambient
+        if not ambient:
+            return
+        reason = "speech" if "audio_output" in message.msg_type else "listening"
+        if message.msg_type.endswith(("_start", "_begin")):
+            ambient.pause(reason)
+        else:
+            ambient.resume(reason)
+
+    def _apply_auto_boost(self, boost: int):
+        """
+        Sets output volume to the user's level plus a boost for ambient noise.
+        Manual changes made while boosted are treated as relative to the boost.
+        :param boost: levels to add to the user's level
+        """
+        with self._io_locks['output']:
+            if self._muted["output"] or self.vol_before_duck is not None:
+                return
+            base = self.vol_level - self._auto_boost
+            if base <= self.MIN_LEVEL:
+                return
+            level = self.bound_level(base + boost)
+            if level != self.vol_level:
+                LOG.debug(f"Auto volume boost {boost}: {self.vol_level} -> {level}")
+                self.set_volume(io='output', setting=level, speak=False)
+            self._auto_boost = level - base
+            self._state.update(auto_volume_boost=self._auto_boost)
+
+    def _get_profile(self, message) -> dict:
+        """
+        Gets the volume profile for the user and current context of message
+        """
+        contexts = list()
+        night_start = int(self.settings.get("night_start", 22))
+        night_end = int(self.settings.get("night_end", 7))
+        hour = datetime.now().hour
+        if (night_start <= hour or hour < night_end) if night_start > night_end \
+                else (night_start <= hour < night_end):
+            contexts.append("night")
+        if self._media_playing:
+            contexts.append("media")
+        if message.context.get("room"):
+            contexts.append(f"room:{message.context['room']}")
+        return self._profiles.resolve(message.context.get("username"), tuple(contexts))
 
     def extract_spoken_volume_level(self, message, default=None):
         level_str = message.data.get('Level', default)
-        level = self.default_level
-        try:
-            level = self.VOLUME_WORDS[level_str]
-        except KeyError:
-            try:
-                level = int(level_str)
-                if level <= 10 and "percent" not in message.data.get("utterance"):
-                    # Translate 1-10 to 10-100 percent if level is numeric only
-                    level = level*10
-            except ValueError:
-                pass
+        profile = self._get_profile(message)
+        parser = self._get_level_parser(message)
+        level = parser.parse_level(message.data.get("utterance", ""), level_str,
+                                   (profile["quiet"], profile["normal"], profile["loud"])) \
+            if parser else None
+        if level is None:
+            level = self.default_mic_level if message.data.get("Mic") else profile["default_level"]
+        if not message.data.get("Mic"):
+            level += profile["offset"]
         level = self.bound_level(level)
         return level
 
+    def extract_spoken_volume_change(self, message, default: int = 10) -> int:
+        """
+        Extracts the amount to change volume by from a request like "turn it up by 20"
+        :param message: Message associated with request
+        :param default: amount to change by if none was spoken
+        :returns: positive amount to change by
+        """
+        parser = self._get_level_parser(message)
+        change = parser.parse_delta(message.data.get("utterance", "")) if parser else None
+        return self.bound_level(change) if change else default
+
 
 def create_skill():
     return VolumeSkill()
@@ -0,0 +1,115 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Offline benchmark for ambient-noise auto volume. Feeds WAV fixtures through
+the ambient level meter and auto volume controller, then reports measured
+levels, the boost that would be applied and CPU cost per frame.
+
+Usage: python test/benchmark/ambient_benchmark.py [WAV ...] [--loops N]
+"""
+
+import argparse
+import importlib.util
+import sys
+
+from os.path import basename, dirname, join
+from time import process_time
+
+SKILL_DIR = dirname(dirname(dirname(__file__)))
+
+
+def load_ambient_module():
+    """
+    Import util/ambient.py without loading the rest of the skill
+    """
+    spec = importlib.util.spec_from_file_location("skill_volume_ambient",
+                                                  join(SKILL_DIR, "util", "ambient.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_fixture(ambient, path, frame_size, window, rate, loops):
+    frames = list(ambient.read_wav_frames(path, frame_size))
+    clock = [0.0]
+    boosts = list()
+    meter = ambient.AmbientLevelMeter(frame_size, window)
+    controller = ambient.AutoVolumeController(boosts.append, clock=lambda: clock[0])
+    levels = list()
+    start = process_time()
+    for _ in range(loops):
+        for frame in frames:
+            meter.add_frame(frame)
+            clock[0] += frame_size / rate
+            if meter.full:
+                levels.append(meter.level_db)
+                controller.update(levels[-1])
+    elapsed = process_time() - start
+    total_frames = len(frames) * loops
+    us_per_frame = 1000000 * elapsed / total_frames
+    return {
+        "fixture": basename(path),
+        "frames": total_frames,
+        "min_db": min(levels) if levels else ambient.SILENCE_DB,
+        "max_db": max(levels) if levels else ambient.SILENCE_DB,
+        "boosts": boosts,
+        "us_per_frame": us_per_frame,
+        "cpu_percent": 100 * us_per_frame * rate / frame_size / 1000000
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("fixtures", nargs="*",
+                        default=[join(SKILL_DIR, "blop-mark-diangelo.wav")],
+                        help="16-bit PCM or 32-bit float WAV files")
+    parser.add_argument("--frame-size", type=int, default=1024)
+    parser.add_argument("--window", type=int, default=16,
+                        help="frames averaged for each level")
+    parser.add_argument("--rate", type=int, default=16000,
+                        help="capture sample rate used to estimate CPU load")
+    parser.add_argument("--loops", type=int, default=100,
+                        help="times to replay each fixture")
+    args = parser.parse_args(args)
+
+    ambient = load_ambient_module()
+    results = [run_fixture(ambient, path, args.frame_size, args.window, args.rate, args.loops)
+               for path in args.fixtures]
+
+    print(f"{'fixture':<28}{'frames':>8}{'min dB':>9}{'max dB':>9}{'us/frame':>10}{'CPU %':>8}")
+    for result in results:
+        print(f"{result['fixture']:<28}{result['frames']:>8}{result['min_db']:>9.1f}"
+              f"{result['max_db']:>9.1f}{result['us_per_frame']:>10.2f}"
+              f"{result['cpu_percent']:>8.3f}")
+        print(f"  boost changes: {result['boosts']}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Offline latency benchmark for the volume intent handlers. Runs each handler
+against an in-memory message bus and a stub mixer backend, then reports
+per-handler latency, backend calls per intent and concurrent throughput.
+
+Usage: python test/benchmark/volume_benchmark.py [--iterations N] [--threads N]
+"""
+
+import argparse
+import importlib.util
+import sys
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from os.path import dirname, join
+from statistics import quantiles
+from threading import Event, Lock
+from time import perf_counter, sleep
+from unittest.mock import patch
+
+from mycroft_bus_client import Message
+
+SKILL_DIR = dirname(dirname(dirname(__file__)))
+
+
+class FakeBus:
+    """
+    Minimal in-memory message bus that calls handlers synchronously
+    """
+    def __init__(self):
+        self.handlers = defaultdict(list)
+        self.emitted = defaultdict(int)
+        self._lock = Lock()
+
+    def on(self, msg_type, handler):
+        with self._lock:
+            self.handlers[msg_type].append(handler)
+
+    def once(self, msg_type, handler):
+        def _once(message):
+            self.remove(msg_type, _once)
+            handler(message)
+        self.on(msg_type, _once)
+
+    def remove(self, msg_type, handler):
+        with self._lock:
+            if handler in self.handlers[msg_type]:
+                self.handlers[msg_type].remove(handler)
+
+    def remove_all_listeners(self, msg_type):
+        with self._lock:
+            self.handlers.pop(msg_type, None)
+
+    def emit(self, message):
+        with self._lock:
+            self.emitted[message.msg_type] += 1
+            handlers = list(self.handlers[message.msg_type])
+        for handler in handlers:
+            handler(message)
+
+    def wait_for_response(self, message, reply_type=None, timeout=3.0):
+        response = dict()
+        received = Event()
+
+        def _handler(msg):
+            response["message"] = msg
+            received.set()
+        reply_type = reply_type or f"{message.msg_type}.response"
+        self.once(reply_type, _handler)
+        self.emit(message)
+        received.wait(timeout)
+        return response.get("message")
+
+
+def load_skill_module():
+    """
+    Import the skill as a package, the same way the skill loader does
+    """
+    spec = importlib.util.spec_from_file_location("skill_volume", join(SKILL_DIR, "__init__.py"),
+                                                  submodule_search_locations=[SKILL_DIR])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_stub_mixer(backends):
+    class StubMixer(backends.VolumeBackend):
+        """
+        In-memory mixer that counts calls and records when a level was last set
+        """
+        name = "stub"
+
+        def __init__(self):
+            self.levels = {"input": 100, "output": 50}
+            self.calls = defaultdict(int)
+            self.applied = Event()
+            self.applied_at = None
+            self._lock = Lock()
+
+        def get_levels(self):
+            with self._lock:
+                self.calls["get_levels"] += 1
+                return self.levels["input"], self.levels["output"]
+
+        def set_level(self, io, setting):
+            with self._lock:
+                self.calls["set_level"] += 1
+                if int(setting) > 0:
+                    self.levels[io] = int(setting)
+                if not self.applied.is_set():
+                    self.applied_at = perf_counter()
+                    self.applied.set()
+
+        @property
+        def total_calls(self):
+            with self._lock:
+                return sum(self.calls.values())
+    return StubMixer()
+
+
+def build_skill(module, mixer, bus, settings):
+    skill = module.VolumeSkill()
+    skill.settings.update(settings)
+    with patch.object(skill, "_init_local_backend", return_value=mixer):
+        skill.bind(bus)
+        skill.initialize()
+    # Wait for the background level probe
+    skill._levels_probed.wait(5)
+    skill.speak_dialog = lambda *args, **kwargs: None
+    skill.speak = lambda *args, **kwargs: None
+    return skill
+
+
+HANDLER_MESSAGES = {
+    "handle_set_volume": ("set volume to 70", {"Volume": "volume", "Level": "70"}),
+    "handle_increase_volume": ("increase volume", {"Volume": "volume", "Increase": "increase"}),
+    "handle_decrease_volume": ("decrease volume", {"Volume": "volume", "Decrease": "decrease"}),
+    "handle_query_volume": ("what is the volume", {"Volume": "volume", "Query": "what is"}),
+    "handle_mute_volume": ("mute volume", {"Volume": "volume", "Mute": "mute",
+                                           "speak_message": False}),
+    "handle_unmute_volume": ("unmute volume", {"Volume": "volume", "Unmute": "unmute"}),
+}
+
+
+# Requests run untimed before each iteration so the timed request changes the mixer
+HANDLER_RESETS = {
+    "handle_set_volume": ("handle_set_volume", "set volume to 30",
+                          {"Volume": "volume", "Level": "30"}),
+    "handle_increase_volume": ("handle_set_volume", "set volume to 50",
+                               {"Volume": "volume", "Level": "50"}),
+    "handle_decrease_volume": ("handle_set_volume", "set volume to 50",
+                               {"Volume": "volume", "Level": "50"}),
+    "handle_mute_volume": ("handle_unmute_volume", "unmute volume",
+                           {"Volume": "volume", "Unmute": "unmute"}),
+    "handle_unmute_volume": ("handle_mute_volume", "mute volume",
+                             {"Volume": "volume", "Mute": "mute", "speak_message": False}),
+}
+
+
+def _message(handler_name, request=None):
+    utterance, data = request or HANDLER_MESSAGES[handler_name]
+    return Message("intent", dict(data, utterance=utterance, lang="en-us"), {})
+
+
+def _apply_timeout(skill):
+    """
+    Longest a scheduled change should take to reach the mixer
+    """
+    return 4 * skill.settings.get("volume_change_window", 0.1) + 1
+
+
+def _reset(skill, mixer, handler_name):
+    """
+    Put the skill in a state where handler_name changes the mixer, then wait
+    for the change and any fade to finish
+    """
+    if handler_name not in HANDLER_RESETS:
+        return
+    reset_handler, utterance, data = HANDLER_RESETS[handler_name]
+    mixer.applied.clear()
+    getattr(skill, reset_handler)(_message(reset_handler, (utterance, data)))
+    mixer.applied.wait(_apply_timeout(skill))
+    _settle(skill)
+
+
+def _settle(skill):
+    """
+    Wait for scheduled changes and fades to finish applying
+    """
+    sleep(skill.settings.get("volume_change_window", 0.1) +
+          skill.settings.get("ramp_duration", 0.3) + 0.05)
+
+
+def _percentile_ms(samples, percentile):
+    if len(samples) < 2:
+        return 1000 * samples[0]
+    return 1000 * quantiles(samples, n=100, method="inclusive")[percentile - 1]
+
+
+def run_latency(skill, mixer, iterations):
+    """
+    Time each handler until the stub mixer's `set_level` runs; handlers only
+    queue changes, so returning from the handler doesn't mean the change was
+    applied. Handlers that don't set a level are timed until they return.
+    """
+    results = dict()
+    for handler_name in HANDLER_MESSAGES:
+        handler = getattr(skill, handler_name)
+        calls = 0
+        samples = list()
+        for _ in range(iterations):
+            _reset(skill, mixer, handler_name)
+            message = _message(handler_name)
+            calls_before = mixer.total_calls
+            mixer.applied.clear()
+            start = perf_counter()
+            handler(message)
+            end = perf_counter()
+            if handler_name in HANDLER_RESETS:
+                if not mixer.applied.wait(_apply_timeout(skill)):
+                    raise RuntimeError(f"{handler_name} didn't set a level")
+                end = mixer.applied_at
+            samples.append(end - start)
+            _settle(skill)
+            calls += mixer.total_calls - calls_before
+        results[handler_name] = {
+            "p50_ms": _percentile_ms(samples, 50),
+            "p99_ms": _percentile_ms(samples, 99),
+            "backend_calls_per_intent": calls / iterations
+        }
+    return results
+
+
+def run_throughput(skill, mixer, iterations, threads):
+    handler_names = ("handle_increase_volume", "handle_decrease_volume",
+                     "handle_set_volume", "handle_query_volume")
+    jobs = [handler_names[i % len(handler_names)] for i in range(iterations)]
+    calls_before = mixer.total_calls
+    start = perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(lambda name: getattr(skill, name)(_message(name)), jobs))
+    elapsed = perf_counter() - start
+    _settle(skill)
+    return {
+        "intents": len(jobs),
+        "threads": threads,
+        "intents_per_second": len(jobs) / elapsed,
+        "backend_calls_per_intent": (mixer.total_calls - calls_before) / len(jobs)
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--window", type=float, default=0.1,
+                        help="volume_change_window setting")
+    parser.add_argument("--ramp", type=float, default=0.0,
+                        help="ramp_duration setting")
+    args = parser.parse_args(args)
+
+    module = load_skill_module()
+    mixer = build_stub_mixer(sys.modules["skill_volume.util.backends"])
+    bus = FakeBus()
+    skill = build_skill(module, mixer, bus, {"volume_change_window": args.window,
+                                             "ramp_duration": args.ramp})
+    try:
+        latency = run_latency(skill, mixer, args.iterations)
+        throughput = run_throughput(skill, mixer, args.iterations * len(HANDLER_MESSAGES),
+                                    args.threads)
+    finally:
+        skill.shutdown()
+
+    print(f"{'handler':<24}{'p50 ms':>10}{'p99 ms':>10}{'calls/intent':>14}")
+    for handler_name, result in latency.items():
+        print(f"{handler_name:<24}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+              f"{result['backend_calls_per_intent']:>14.2f}")
+    print(f"\n{throughput['intents']} intents on {throughput['threads']} threads: "
+          f"{throughput['intents_per_second']:.1f} intents/s, "
+          f"{throughput['backend_calls_per_intent']:.2f} backend calls/intent")
+    return latency, throughput
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import sys
+import unittest
+
+from os.path import dirname
+from unittest.mock import patch
+
+sys.path.append(dirname(dirname(dirname(__file__))))
+from util.dedup import RequestDeduplicator
+
+
+class TestRequestDeduplicator(unittest.TestCase):
+    def test_add(self):
+        dedup = RequestDeduplicator()
+        self.assertTrue(dedup.add("request"))
+        self.assertFalse(dedup.add("request"))
+        self.assertTrue(dedup.add("other"))
+
+    def test_discard(self):
+        dedup = RequestDeduplicator()
+        dedup.add("request")
+        dedup.discard("request")
+        self.assertTrue(dedup.add("request"))
+        # Discarding an unknown ID is a no-op
+        dedup.discard("unknown")
+
+    def test_ttl(self):
+        dedup = RequestDeduplicator(ttl=10)
+        with patch("util.dedup.monotonic", return_value=100):
+            dedup.add("request")
+        with patch("util.dedup.monotonic", return_value=105):
+            self.assertFalse(dedup.add("request"))
+        with patch("util.dedup.monotonic", return_value=111):
+            self.assertTrue(dedup.add("request"))
+
+    def test_max_size(self):
+        dedup = RequestDeduplicator(max_size=2)
+        for request_id in ("a", "b", "c"):
+            dedup.add(request_id)
+        # The oldest ID is forgotten first
+        self.assertFalse(dedup.add("c"))
+        self.assertTrue(dedup.add("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
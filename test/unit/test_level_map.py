@@ -0,0 +1,118 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import sys
+import unittest
+
+from os.path import dirname
+
+sys.path.append(dirname(dirname(dirname(__file__))))
+from util.backends import VolumeBackend
+from util.level_map import LevelMap, MappedBackend
+
+
+class FakeBackend(VolumeBackend):
+    name = "fake"
+
+    def __init__(self, volume=50):
+        self.volume = volume
+        self.calls = list()
+
+    def get_levels(self):
+        return 100, self.volume
+
+    def set_level(self, io, setting):
+        self.calls.append((io, setting))
+
+    def set_muted_level(self, io, setting):
+        self.calls.append(("muted", io, setting))
+
+
+class TestLevelMap(unittest.TestCase):
+    def test_linear_default(self):
+        level_map = LevelMap()
+        for level in range(101):
+            self.assertEqual(level_map.to_volume(level), level)
+            self.assertEqual(level_map.to_level(level), level)
+
+    def test_linear_range(self):
+        level_map = LevelMap(20, 80)
+        self.assertEqual(level_map.to_volume(0), 0)
+        self.assertEqual(level_map.to_volume(1), 21)
+        self.assertEqual(level_map.to_volume(100), 80)
+        self.assertEqual(level_map.to_level(10), 1)
+        self.assertEqual(level_map.to_level(95), 100)
+
+    def test_log_taper(self):
+        level_map = LevelMap(taper="log", db_range=30)
+        self.assertEqual(level_map.to_volume(100), 100)
+        # Each 10 levels is 3 dB
+        self.assertEqual(level_map.to_volume(90), round(100 * 10 ** (-3 / 20)))
+        volumes = [level_map.to_volume(level) for level in range(101)]
+        self.assertEqual(volumes, sorted(volumes))
+
+    def test_unknown_taper(self):
+        self.assertEqual(LevelMap(taper="unknown").taper, "linear")
+
+    def test_round_trip(self):
+        for level_map in (LevelMap(), LevelMap(0, 83), LevelMap(10, 90),
+                          LevelMap(taper="log"), LevelMap(0, 83, "log", 40)):
+            for level in range(101):
+                volume = level_map.to_volume(level)
+                shared = [other for other in range(101) if level_map.to_volume(other) == volume]
+                if len(shared) == 1:
+                    self.assertEqual(level_map.to_level(volume), level)
+                else:
+                    # Levels sharing a volume read back as one of them
+                    self.assertIn(level_map.to_level(volume), shared)
+
+    def test_bounds(self):
+        level_map = LevelMap(0, 83)
+        self.assertEqual(level_map.to_volume(150), 83)
+        self.assertEqual(level_map.to_volume(-5), 0)
+        self.assertEqual(level_map.to_level(150), 100)
+        self.assertEqual(level_map.to_level(-5), 0)
+
+
+class TestMappedBackend(unittest.TestCase):
+    def test_output_mapped(self):
+        backend = FakeBackend(volume=83)
+        mapped = MappedBackend(backend, LevelMap(0, 83))
+        self.assertEqual(mapped.name, "fake")
+        self.assertEqual(mapped.get_levels(), (100, 100))
+        mapped.set_level("output", 100)
+        mapped.set_level("output", 0)
+        mapped.set_level("output", -1)
+        mapped.set_level("input", 50)
+        mapped.set_muted_level("output", 100)
+        self.assertEqual(backend.calls, [("output", 83), ("output", 0), ("output", -1),
+                                         ("input", 50), ("muted", "output", 83)])
+
+
+if __name__ == "__main__":
+    unittest.main()
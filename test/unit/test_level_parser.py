@@ -0,0 +1,93 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import sys
+import unittest
+
+from os.path import dirname
+from unittest.mock import patch
+
+SKILL_DIR = dirname(dirname(dirname(__file__)))
+sys.path.append(SKILL_DIR)
+from util.level_parser import VolumeLevelParser, load_parsers, normalize
+
+PRESETS = (30, 60, 90)
+
+
+class TestVolumeLevelParser(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = VolumeLevelParser(SKILL_DIR, "en-us", PRESETS)
+
+    def test_normalize(self):
+        self.assertEqual(normalize("  Set the  VOLUME to 5 "), "set the volume to 5")
+
+    def test_parse_digits(self):
+        self.assertEqual(self.parser.parse_level("set volume to 70"), 70)
+        self.assertEqual(self.parser.parse_level("set volume to 70", "70"), 70)
+
+    def test_parse_scale_of_ten(self):
+        self.assertEqual(self.parser.parse_level("set volume to 5"), 50)
+        self.assertEqual(self.parser.parse_level("set volume to 5 percent"), 5)
+
+    def test_parse_presets(self):
+        self.assertEqual(self.parser.parse_level("make it quiet"), 30)
+        self.assertEqual(self.parser.parse_level("set volume to loud"), 90)
+        self.assertEqual(self.parser.parse_level("set volume to loud", presets=(10, 20, 40)), 40)
+
+    def test_parse_max(self):
+        self.assertEqual(self.parser.parse_level("turn it all the way up"), 100)
+
+    def test_parse_no_level(self):
+        self.assertIsNone(self.parser.parse_level("what is the volume"))
+
+    def test_parse_number_words(self):
+        with patch("util.level_parser.extract_number", return_value=25) as extract:
+            self.parser._parse_level.cache_clear()
+            self.assertEqual(self.parser.parse_level("set volume to twenty five"), 25)
+            extract.assert_called()
+        with patch("util.level_parser.extract_number", return_value=False):
+            self.parser._parse_level.cache_clear()
+            self.assertIsNone(self.parser.parse_level("set volume to something"))
+        self.parser._parse_level.cache_clear()
+
+    def test_parse_delta(self):
+        self.assertEqual(self.parser.parse_delta("turn it up by 20"), 20)
+        self.assertIsNone(self.parser.parse_delta("turn it up"))
+        # An amount after "to" is an absolute level
+        self.assertIsNone(self.parser.parse_delta("turn it up to 20"))
+
+    def test_load_parsers(self):
+        parsers = load_parsers(SKILL_DIR, PRESETS)
+        self.assertIn("en-us", parsers)
+        self.assertEqual(parsers["en-us"].lang, "en-us")
+        self.assertEqual(load_parsers(dirname(__file__), PRESETS), dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
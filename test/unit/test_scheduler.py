@@ -0,0 +1,122 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import sys
+import unittest
+
+from os.path import dirname
+from threading import Event, Lock
+
+sys.path.append(dirname(dirname(dirname(__file__))))
+from util.scheduler import VolumeChangeScheduler
+
+
+class FakeMixer:
+    def __init__(self, level=50):
+        self.levels = {"input": 100, "output": level}
+        self.applied = list()
+        self.lock = Lock()
+
+    def get_level(self, io):
+        return self.levels[io]
+
+    def apply_level(self, io, level, **kwargs):
+        with self.lock:
+            self.levels[io] = level
+            self.applied.append((io, level, kwargs))
+
+
+class TestVolumeChangeScheduler(unittest.TestCase):
+    def setUp(self):
+        self.mixer = FakeMixer()
+        self.scheduler = VolumeChangeScheduler(self.mixer.get_level, self.mixer.apply_level,
+                                               window=0.05)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_merge_deltas(self):
+        futures = [self.scheduler.submit("output", delta=10) for _ in range(3)]
+        for future in futures:
+            self.assertEqual(future.result(1), (50, 80))
+        self.assertEqual(self.mixer.applied, [("output", 80, {})])
+
+    def test_level_replaces_pending_delta(self):
+        self.scheduler.submit("output", delta=10)
+        future = self.scheduler.submit("output", level=20)
+        self.scheduler.submit("output", delta=-5, feedback=False)
+        self.assertEqual(future.result(1), (50, 15))
+        self.assertEqual(self.mixer.applied, [("output", 15, {"feedback": False})])
+
+    def test_io_applied_separately(self):
+        output = self.scheduler.submit("output", level=30)
+        mic = self.scheduler.submit("input", delta=-40)
+        self.assertEqual(output.result(1), (50, 30))
+        self.assertEqual(mic.result(1), (100, 60))
+        self.assertEqual(len(self.mixer.applied), 2)
+
+    def test_bounds(self):
+        self.assertEqual(self.scheduler.submit("output", delta=80).result(1), (50, 100))
+        self.assertEqual(self.scheduler.submit("output", level=-10).result(1), (100, 0))
+
+    def test_error_sets_exception(self):
+        def _fail(io, level):
+            raise RuntimeError("mixer failed")
+        scheduler = VolumeChangeScheduler(self.mixer.get_level, _fail, window=0)
+        try:
+            with self.assertRaises(RuntimeError):
+                scheduler.submit("output", level=20).result(1)
+        finally:
+            scheduler.shutdown()
+
+    def test_shutdown_applies_pending(self):
+        scheduler = VolumeChangeScheduler(self.mixer.get_level, self.mixer.apply_level,
+                                          window=60)
+        future = scheduler.submit("output", level=70)
+        scheduler.shutdown()
+        self.assertEqual(future.result(0), (50, 70))
+        with self.assertRaises(RuntimeError):
+            scheduler.submit("output", level=20)
+
+    def test_window_expires_under_load(self):
+        applied = Event()
+        scheduler = VolumeChangeScheduler(self.mixer.get_level,
+                                          lambda io, level: applied.set(), window=0.05)
+        try:
+            for _ in range(100):
+                scheduler.submit("output", delta=1)
+                if applied.wait(0.01):
+                    break
+            # Pending changes are applied within 4 windows even if requests keep coming
+            self.assertTrue(applied.is_set())
+        finally:
+            scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import sys
+import unittest
+
+from os.path import dirname, isfile, join
+from tempfile import TemporaryDirectory
+from time import sleep
+
+sys.path.append(dirname(dirname(dirname(__file__))))
+from util.state_store import VolumeStateStore
+
+
+class TestVolumeStateStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.path = join(self.temp_dir.name, "state", "volume.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _read(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    def test_flush_and_reload(self):
+        store = VolumeStateStore(self.path, debounce=60)
+        store.update(output=40, output_muted=True)
+        self.assertEqual(store.get("output"), 40)
+        self.assertFalse(isfile(self.path))
+        store.flush()
+        self.assertEqual(self._read(), {"output": 40, "output_muted": True})
+        self.assertEqual(VolumeStateStore(self.path).get("output_muted"), True)
+
+    def test_debounced_write(self):
+        store = VolumeStateStore(self.path, debounce=0.05)
+        for level in range(10):
+            store.update(output=level)
+        sleep(0.2)
+        self.assertEqual(self._read(), {"output": 9})
+
+    def test_unchanged_update_not_written(self):
+        store = VolumeStateStore(self.path, debounce=60)
+        store.update(output=40)
+        store.flush()
+        store.update(output=40)
+        self.assertIsNone(store._timer)
+
+    def test_provider(self):
+        store = VolumeStateStore(self.path, debounce=60)
+        timers = [{"id": "output.unmute"}]
+        store.set_provider("timers", lambda: list(timers))
+        store.set_provider("broken", lambda: 1 / 0)
+        store.touch()
+        store.flush()
+        self.assertEqual(self._read(), {"timers": [{"id": "output.unmute"}]})
+        timers.clear()
+        store.flush()
+        self.assertEqual(self._read(), {"timers": []})
+
+    def test_invalid_file(self):
+        store = VolumeStateStore(self.path)
+        store.flush()
+        with open(self.path, "w") as f:
+            f.write("not json")
+        self.assertIsNone(VolumeStateStore(self.path).get("output"))
+        with open(self.path, "w") as f:
+            f.write("[]")
+        self.assertEqual(VolumeStateStore(self.path).get("output", 50), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
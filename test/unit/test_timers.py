@@ -0,0 +1,119 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import sys
+import unittest
+
+from os.path import dirname
+from threading import Event
+from time import sleep, time
+
+sys.path.append(dirname(dirname(dirname(__file__))))
+from util.timers import VolumeTimers
+
+
+class TestVolumeTimers(unittest.TestCase):
+    def setUp(self):
+        self.expired = list()
+        self.expired_event = Event()
+        self.changes = 0
+
+        def _on_expired(data):
+            self.expired.append(data)
+            self.expired_event.set()
+
+        def _on_changed():
+            self.changes += 1
+        self.timers = VolumeTimers(_on_expired, _on_changed)
+
+    def tearDown(self):
+        self.timers.shutdown()
+
+    def test_expire_in_order(self):
+        self.timers.schedule("b", 0.1, {"action": "b"})
+        self.timers.schedule("a", 0.05, {"action": "a"})
+        self.timers.schedule("c", 0.15, {"action": "c"})
+        for _ in range(3):
+            self.assertTrue(self.expired_event.wait(1))
+            self.expired_event.clear()
+        self.assertEqual([data["action"] for data in self.expired], ["a", "b", "c"])
+        self.assertEqual(self.timers.get_timers(), [])
+
+    def test_cancel(self):
+        self.timers.schedule("output.unmute", 0.05, {"action": "unmute"})
+        self.assertTrue(self.timers.cancel("output.unmute"))
+        self.assertFalse(self.timers.cancel("output.unmute"))
+        self.assertFalse(self.expired_event.wait(0.2))
+        self.assertEqual(self.changes, 2)
+
+    def test_reschedule_replaces(self):
+        self.timers.schedule("output.revert", 0.05, {"level": 10})
+        self.timers.schedule("output.revert", 0.1, {"level": 20})
+        self.assertEqual(self.timers.get("output.revert")["data"], {"level": 20})
+        self.assertTrue(self.expired_event.wait(1))
+        sleep(0.1)
+        self.assertEqual(self.expired, [{"level": 20}])
+
+    def test_get(self):
+        self.assertIsNone(self.timers.get("output.unmute"))
+        self.timers.schedule("output.unmute", 60, {"action": "unmute"})
+        timer = self.timers.get("output.unmute")
+        self.assertEqual(timer["id"], "output.unmute")
+        self.assertAlmostEqual(timer["due"], time() + 60, delta=1)
+        # Returned timers are copies
+        timer["data"] = None
+        self.assertEqual(self.timers.get("output.unmute")["data"], {"action": "unmute"})
+
+    def test_restore_saved(self):
+        expired = Event()
+        timers = VolumeTimers(lambda data: expired.set(),
+                              timers=[{"id": "past", "due": time() - 1, "data": {}},
+                                      {"id": "future", "due": time() + 60, "data": {}},
+                                      {"id": "invalid"}])
+        try:
+            self.assertTrue(expired.wait(1))
+            self.assertEqual([timer["id"] for timer in timers.get_timers()], ["future"])
+        finally:
+            timers.shutdown()
+
+    def test_expired_error_handled(self):
+        def _on_expired(data):
+            if data.get("fail"):
+                raise RuntimeError("failed")
+            self.expired_event.set()
+        timers = VolumeTimers(_on_expired)
+        try:
+            timers.schedule("fail", 0, {"fail": True})
+            timers.schedule("ok", 0.05, {})
+            self.assertTrue(self.expired_event.wait(1))
+        finally:
+            timers.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
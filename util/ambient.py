@@ -0,0 +1,323 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import struct
+
+from math import log10
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Callable, Iterator, Optional
+from ovos_utils.log import LOG
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None
+
+# Floor for silent input, in dBFS
+SILENCE_DB = -100.0
+
+
+class AmbientLevelMeter:
+    """
+    Tracks ambient loudness as the RMS of the last `window` frames of 16-bit
+    mono PCM. Buffers are allocated once, so adding a frame does not allocate.
+    """
+    def __init__(self, frame_size: int = 1024, window: int = 16):
+        """
+        :param frame_size: samples per frame
+        :param window: number of frames to average over
+        """
+        if np is None:
+            raise ImportError("numpy is not installed")
+        self.frame_size = frame_size
+        self._scratch = np.zeros(frame_size, dtype=np.float32)
+        self._scale = np.float32(1 / 32768)
+        self._ring = np.zeros(window, dtype=np.float64)
+        self._index = 0
+        self._count = 0
+        self._total = 0.0
+
+    @property
+    def full(self) -> bool:
+        """
+        True once a full window of frames has been added
+        """
+        return self._count >= len(self._ring)
+
+    @property
+    def level_db(self) -> float:
+        """
+        RMS level over the window in dBFS
+        """
+        if not self._count:
+            return SILENCE_DB
+        mean_square = self._total / min(self._count, len(self._ring))
+        if mean_square <= 0:
+            return SILENCE_DB
+        return max(10 * log10(mean_square), SILENCE_DB)
+
+    def add_frame(self, frame: bytes):
+        """
+        Add audio to the window; input longer than `frame_size` is split into frames
+        :param frame: 16-bit little-endian mono PCM
+        """
+        samples = np.frombuffer(frame, dtype="<i2")
+        for start in range(0, len(samples), self.frame_size):
+            chunk = samples[start:start + self.frame_size]
+            scratch = self._scratch[:len(chunk)]
+            np.multiply(chunk, self._scale, out=scratch, casting="unsafe")
+            self._add_mean_square(float(np.dot(scratch, scratch)) / len(chunk))
+
+    def _add_mean_square(self, value: float):
+        self._total += value - self._ring[self._index]
+        self._ring[self._index] = value
+        self._index = (self._index + 1) % len(self._ring)
+        self._count += 1
+        if self._index == 0:
+            # Re-sum once per window so rounding errors don't accumulate
+            self._total = float(self._ring.sum())
+
+    def reset(self):
+        """
+        Discard all frames in the window
+        """
+        self._ring.fill(0)
+        self._index = 0
+        self._count = 0
+        self._total = 0.0
+
+
+class AutoVolumeController:
+    """
+    Maps ambient loudness to a boost added to the user's output level. The
+    boost only changes when ambient level moves by more than `hysteresis_db`,
+    at most once per `min_interval` seconds and by at most `max_step`.
+    """
+    def __init__(self, apply_boost: Callable[[int], None], max_boost: int = 30,
+                 quiet_db: float = -50, loud_db: float = -20,
+                 hysteresis_db: float = 3, min_interval: float = 5,
+                 max_step: int = 10, clock: Callable[[], float] = monotonic):
+        """
+        :param apply_boost: method called with a new boost (0 to max_boost)
+        :param max_boost: boost applied at or above `loud_db`
+        :param quiet_db: ambient level (dBFS) at or below which no boost is applied
+        :param loud_db: ambient level (dBFS) at which `max_boost` is applied
+        :param hysteresis_db: change in ambient level required to change the boost
+        :param min_interval: minimum seconds between boost changes
+        :param max_step: largest change to the boost at once
+        :param clock: time source, in seconds
+        """
+        self._apply_boost = apply_boost
+        self.max_boost = max_boost
+        self.quiet_db = quiet_db
+        self.loud_db = loud_db
+        self.hysteresis_db = hysteresis_db
+        self.min_interval = min_interval
+        self.max_step = max_step
+        self._clock = clock
+        self._last_change = None
+        self._reference_db = None
+        self.boost = 0
+
+    def target_boost(self, level_db: float) -> int:
+        """
+        :param level_db: ambient level in dBFS
+        :returns: boost for level_db, ignoring hysteresis and rate limits
+        """
+        span = self.loud_db - self.quiet_db
+        fraction = (level_db - self.quiet_db) / span if span > 0 else float(level_db >= self.loud_db)
+        return round(self.max_boost * min(max(fraction, 0.0), 1.0))
+
+    def update(self, level_db: float) -> Optional[int]:
+        """
+        Handle a new ambient level measurement
+        :param level_db: ambient level in dBFS
+        :returns: new boost if it was changed, else None
+        """
+        if self._reference_db is not None and \
+                abs(level_db - self._reference_db) < self.hysteresis_db:
+            return None
+        now = self._clock()
+        if self._last_change is not None and now - self._last_change < self.min_interval:
+            return None
+        target = self.target_boost(level_db)
+        if target == self.boost:
+            self._reference_db = level_db
+            return None
+        step = min(max(target - self.boost, -self.max_step), self.max_step)
+        self.boost += step
+        self._last_change = now
+        if self.boost == target:
+            self._reference_db = level_db
+        self._apply_boost(self.boost)
+        return self.boost
+
+
+class AlsaCaptureSource:
+    """
+    Reads 16-bit mono frames from an ALSA capture device
+    """
+    def __init__(self, device: str = "default", rate: int = 16000, frame_size: int = 1024):
+        if not alsaaudio:
+            raise ImportError("pyalsaaudio is not installed")
+        self._pcm = alsaaudio.PCM(type=alsaaudio.PCM_CAPTURE, mode=alsaaudio.PCM_NORMAL,
+                                  device=device, channels=1, rate=rate,
+                                  format=alsaaudio.PCM_FORMAT_S16_LE, periodsize=frame_size)
+
+    def read(self) -> Optional[bytes]:
+        """
+        Block until a frame is available
+        :returns: PCM bytes, or None if the device could not be read
+        """
+        length, data = self._pcm.read()
+        return data if length > 0 else None
+
+    def close(self):
+        self._pcm.close()
+
+
+def read_wav_frames(path: str, frame_size: int = 1024) -> Iterator[bytes]:
+    """
+    Read a 16-bit PCM or 32-bit float WAV file as 16-bit mono frames, i.e. to
+    test the meter offline with recorded audio
+    :param path: path to WAV file
+    :param frame_size: samples per frame
+    :returns: iterator of 16-bit mono PCM frames
+    """
+    if np is None:
+        raise ImportError("numpy is not installed")
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError(f"Not a WAV file: {path}")
+    fmt = samples = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id, size = struct.unpack_from("<4sI", data, offset)
+        if chunk_id == b"fmt ":
+            format_tag, channels, _, _, _, bits = struct.unpack_from("<HHIIHH", data,
+                                                                     offset + 8)
+            fmt = format_tag, channels, bits
+        elif chunk_id == b"data":
+            samples = data[offset + 8:offset + 8 + size]
+        offset += 8 + size + (size & 1)
+    if not fmt or samples is None:
+        raise ValueError(f"Missing fmt or data chunk: {path}")
+    format_tag, channels, bits = fmt
+    if format_tag == 1 and bits == 16:
+        pcm = np.frombuffer(samples, dtype="<i2")
+    elif format_tag == 3 and bits == 32:
+        pcm = (np.clip(np.frombuffer(samples, dtype="<f4"), -1, 1) * 32767).astype("<i2")
+    else:
+        raise ValueError(f"Unsupported WAV format {format_tag} ({bits} bit): {path}")
+    pcm = pcm[::channels]
+    for start in range(0, len(pcm), frame_size):
+        yield pcm[start:start + frame_size].tobytes()
+
+
+class AmbientMonitor:
+    """
+    Reads frames from a source on a background thread and passes the
+    ambient level to a controller every `interval` seconds
+    """
+    def __init__(self, read_frame: Callable[[], Optional[bytes]],
+                 meter: AmbientLevelMeter, controller: AutoVolumeController,
+                 interval: float = 1.0, on_stopped: Optional[Callable[[], None]] = None):
+        """
+        :param read_frame: blocking method returning the next frame
+        :param meter: meter to add frames to
+        :param controller: controller to pass ambient levels to
+        :param interval: seconds between controller updates
+        :param on_stopped: method called after the monitor stops, i.e. to close the source
+        """
+        self.meter = meter
+        self.controller = controller
+        self.interval = interval
+        self._read_frame = read_frame
+        self._on_stopped = on_stopped
+        self._lock = Lock()
+        self._paused = set()
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, name="AmbientMonitor", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def pause(self, reason: str):
+        """
+        Ignore frames, i.e. while Neon or the user is speaking
+        :param reason: name of the pause, passed to `resume` to end it
+        """
+        with self._lock:
+            self._paused.add(reason)
+
+    def resume(self, reason: str):
+        """
+        End a pause; frames from before the last pause ends are discarded
+        :param reason: name passed to `pause`
+        """
+        with self._lock:
+            if reason not in self._paused:
+                return
+            self._paused.discard(reason)
+            if not self._paused:
+                self.meter.reset()
+
+    def shutdown(self):
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join(2)
+
+    def _run(self):
+        next_update = monotonic() + self.interval
+        try:
+            while not self._stopped.is_set():
+                frame = self._read_frame()
+                if frame is None:
+                    self._stopped.wait(0.1)
+                    continue
+                with self._lock:
+                    if self._paused:
+                        continue
+                    self.meter.add_frame(frame)
+                    if monotonic() < next_update or not self.meter.full:
+                        continue
+                    level_db = self.meter.level_db
+                next_update = monotonic() + self.interval
+                self.controller.update(level_db)
+        except Exception as e:
+            LOG.error(f"Ambient monitor stopped: {e}")
+        finally:
+            if self._on_stopped:
+                self._on_stopped()
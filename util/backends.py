@@ -0,0 +1,357 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import subprocess
+
+from os.path import join
+from threading import Event, Lock
+from typing import Dict, Optional, Tuple
+from mycroft_bus_client import Message
+from ovos_utils.log import LOG
+
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None
+
+try:
+    import pulsectl
+except (ImportError, OSError):
+    # OSError if libpulse is not installed
+    pulsectl = None
+
+
+class VolumeBackend:
+    """
+    Base class for objects that read and write system audio levels
+    """
+    name = "base"
+    # Shortest practical time between consecutive writes, in seconds
+    min_step_interval = 0.02
+    # True if `set_muted_level` can change the level of a muted io
+    can_set_muted_level = False
+
+    def get_levels(self) -> Tuple[int, int]:
+        """
+        Read the current system levels
+        :returns: tuple of input level, output level (0-100)
+        """
+        raise NotImplementedError
+
+    def set_level(self, io: str, setting: int):
+        """
+        Apply a level to the requested io
+        :param io: "input" or "output"
+        :param setting: (0-100) (0 for mute, -1 for unmute)
+        """
+        raise NotImplementedError
+
+    def set_muted_level(self, io: str, setting: int):
+        """
+        Set the level a muted io returns to when unmuted, without unmuting it
+        :param io: "input" or "output"
+        :param setting: level (1-100)
+        """
+        raise NotImplementedError
+
+    def shutdown(self):
+        """
+        Release any resources held by this backend
+        """
+        pass
+
+
+class ShellBackend(VolumeBackend):
+    """
+    Legacy backend that calls `getLevel`/`setLevel` from Neon's functions.sh
+    """
+    name = "shell"
+    min_step_interval = 0.1
+
+    def __init__(self, ngi_dir: str, temp_dir: str):
+        self.ngi_dir = ngi_dir
+        self.temp_dir = temp_dir
+
+    def get_levels(self) -> Tuple[int, int]:
+        subprocess.call(['bash', '-c', ". " + self.ngi_dir + "/functions.sh; getLevel; exit"])
+        LOG.debug("Volume Updated")
+        with open(join(self.temp_dir, "input_volume")) as f:
+            mic_level = int(f.read())
+        with open(join(self.temp_dir, "output_volume")) as f:
+            vol_level = int(f.read())
+        return mic_level, vol_level
+
+    def set_level(self, io: str, setting: int):
+        # Wait so consecutive writes (i.e. fade steps) are applied in order
+        subprocess.call(['bash', '-c', ". " + self.ngi_dir + "/functions.sh; setLevel " +
+                         str(io) + " " + str(setting)])
+
+
+class AlsaBackend(VolumeBackend):
+    """
+    In-process backend that talks to the ALSA mixer (PulseAudio via the ALSA
+    `pulse` plugin) directly through pyalsaaudio.
+    """
+    name = "alsa"
+    can_set_muted_level = True
+
+    def __init__(self, output_control: Optional[str] = "Master", input_control: str = "Capture",
+                 device: str = "default"):
+        """
+        :param output_control: playback mixer control, None to only control input
+        :param input_control: capture mixer control
+        :param device: ALSA device to open controls on
+        """
+        if not alsaaudio:
+            raise ImportError("pyalsaaudio is not installed")
+        self._output = alsaaudio.Mixer(output_control, device=device) if output_control else None
+        try:
+            self._input = alsaaudio.Mixer(input_control, device=device)
+        except alsaaudio.ALSAAudioError as e:
+            if not self._output:
+                raise
+            LOG.warning(f"No input mixer available: {e}")
+            self._input = None
+
+    def _get_mixer(self, io: str):
+        mixer = self._input if str(io) == "input" else self._output
+        if not mixer:
+            raise RuntimeError(f"No mixer available for {io}")
+        return mixer
+
+    def get_levels(self) -> Tuple[int, int]:
+        vol_level = self._read_level(self._output, alsaaudio.PCM_PLAYBACK) if self._output else 0
+        mic_level = self._read_level(self._input, alsaaudio.PCM_CAPTURE) if self._input else 0
+        return mic_level, vol_level
+
+    @staticmethod
+    def _read_level(mixer, pcm_type) -> int:
+        levels = mixer.getvolume(pcm_type)
+        return round(sum(levels) / len(levels)) if levels else 0
+
+    def set_level(self, io: str, setting: int):
+        mixer = self._get_mixer(io)
+        setting = int(setting)
+        if setting in (0, -1):
+            self._set_mute(mixer, io, setting == 0)
+        else:
+            if str(io) == "input":
+                mixer.setvolume(setting, pcmtype=alsaaudio.PCM_CAPTURE)
+            else:
+                mixer.setvolume(setting)
+            self._set_mute(mixer, io, False)
+
+    def set_muted_level(self, io: str, setting: int):
+        mixer = self._get_mixer(io)
+        try:
+            muted = not all(mixer.getrec()) if str(io) == "input" else any(mixer.getmute())
+        except alsaaudio.ALSAAudioError:
+            # Control has no switch, so mute is emulated with the level
+            return
+        if not muted:
+            return
+        mixer.setvolume(int(setting), pcmtype=alsaaudio.PCM_CAPTURE if str(io) == "input"
+                        else alsaaudio.PCM_PLAYBACK)
+
+    @staticmethod
+    def _set_mute(mixer, io: str, mute: bool):
+        try:
+            if str(io) == "input":
+                mixer.setrec(0 if mute else 1)
+            else:
+                mixer.setmute(1 if mute else 0)
+        except alsaaudio.ALSAAudioError:
+            # Control has no switch; emulate mute with the level
+            if mute:
+                mixer.setvolume(0, pcmtype=alsaaudio.PCM_CAPTURE if str(io) == "input"
+                                else alsaaudio.PCM_PLAYBACK)
+
+    def shutdown(self):
+        for mixer in (self._output, self._input):
+            if mixer:
+                mixer.close()
+
+
+class BusBackend(VolumeBackend):
+    """
+    Backend for Mycroft enclosures that handle `mycroft.volume.*` bus messages.
+    The output level is kept up to date from responses and volume broadcasts
+    on the bus so reads don't have to wait on the enclosure.
+    """
+    name = "bus"
+    min_step_interval = 0.05
+
+    def __init__(self, bus, timeout: Optional[float] = None,
+                 input_mixer: Optional[VolumeBackend] = None):
+        """
+        :param bus: MessageBusClient connection
+        :param timeout: seconds to wait for the enclosure to report a level
+        :param input_mixer: backend to control input gain with, if available
+        """
+        self.bus = bus
+        self.timeout = timeout or 3
+        self.input_mixer = input_mixer
+        self._mic_level = 100
+        self._level = None
+        self._level_event = Event()
+        self.bus.on("mycroft.volume.get.response", self._on_level)
+        self.bus.on("mycroft.volume.set", self._on_level)
+        self.bus.on("mycroft.volume.increase", self._on_level_changed)
+        self.bus.on("mycroft.volume.decrease", self._on_level_changed)
+        self.request_level()
+
+    @property
+    def level(self) -> Optional[int]:
+        """
+        Last output level reported on the bus, None if unknown
+        """
+        return self._level
+
+    def request_level(self):
+        """
+        Ask the enclosure for the current output level without waiting
+        """
+        self.bus.emit(Message("mycroft.volume.get", context={"origin": "volume.neon"}))
+
+    def _on_level(self, message):
+        if not isinstance(message.data.get("percent"), (int, float)):
+            return
+        self._level = self.parse_percent(message)
+        self._level_event.set()
+
+    def _on_level_changed(self, message):
+        self._level = None
+        self._level_event.clear()
+        self.request_level()
+
+    def get_levels(self) -> Tuple[int, int]:
+        mic_level = self.input_mixer.get_levels()[0] if self.input_mixer else self._mic_level
+        if self._level is None:
+            self._level_event.clear()
+            self.request_level()
+            if not self._level_event.wait(self.timeout) or self._level is None:
+                raise Exception("No response from enclosure module!")
+        return mic_level, self._level
+
+    @staticmethod
+    def parse_percent(message) -> int:
+        """
+        Parse a level from a `mycroft.volume.*` message
+        :param message: Message with a `percent` field in data
+        :returns: level (0-100)
+        """
+        vol_percent = message.data.get("percent")
+        if isinstance(vol_percent, int):
+            return vol_percent
+        elif isinstance(vol_percent, float):
+            return round(100 * vol_percent)
+        LOG.error(message)
+        return 0
+
+    def set_level(self, io: str, setting: int):
+        if str(io) == "input":
+            self._set_input_level(setting)
+        elif str(setting) == '0':
+            self.bus.emit(Message("mycroft.volume.mute", {"mute": True}, {"origin": "volume.neon"}))
+        elif str(setting) == '-1':
+            self.bus.emit(Message("mycroft.volume.mute", {"mute": False}, {"origin": "volume.neon"}))
+        else:
+            self.bus.emit(Message("mycroft.volume.set", {"percent": setting/100}, {"origin": "volume.neon"}))
+
+    def _set_input_level(self, setting: int):
+        # Mute state is handled by the listener so wake words are ignored too
+        if str(setting) == '0':
+            self.bus.emit(Message("mycroft.mic.mute", context={"origin": "volume.neon"}))
+        elif str(setting) == '-1':
+            self.bus.emit(Message("mycroft.mic.unmute", context={"origin": "volume.neon"}))
+        elif self.input_mixer:
+            self._mic_level = int(setting)
+            self._set_input_mixer(setting)
+            self.bus.emit(Message("mycroft.mic.unmute", context={"origin": "volume.neon"}))
+        else:
+            LOG.warning(f"Input gain controls not available!")
+        if self.input_mixer and str(setting) in ('0', '-1'):
+            self._set_input_mixer(setting)
+
+    def _set_input_mixer(self, setting: int):
+        # The listener already handled mute state; a mixer error shouldn't abort the change
+        try:
+            self.input_mixer.set_level("input", setting)
+        except Exception as e:
+            LOG.error(f"Failed to set input mixer: {e}")
+
+    def shutdown(self):
+        if self.input_mixer:
+            self.input_mixer.shutdown()
+        self.bus.remove("mycroft.volume.get.response", self._on_level)
+        self.bus.remove("mycroft.volume.set", self._on_level)
+        self.bus.remove("mycroft.volume.increase", self._on_level_changed)
+        self.bus.remove("mycroft.volume.decrease", self._on_level_changed)
+
+
+class PulseStreamMixer:
+    """
+    Applies voice, media and alert levels as PulseAudio stream-restore entries
+    for media roles, so they also apply to streams started later. All entries
+    are written in one request.
+    """
+    STREAM_ROLES = {
+        "voice": ("a11y", "phone"),
+        "media": ("music", "video", "game", "animation", "production"),
+        "alerts": ("event",)
+    }
+
+    def __init__(self, stream_roles: Optional[Dict[str, Tuple[str, ...]]] = None):
+        """
+        :param stream_roles: dict of stream name to `media.role` values
+        """
+        if not pulsectl:
+            raise ImportError("pulsectl is not installed")
+        self.stream_roles = stream_roles or self.STREAM_ROLES
+        self._lock = Lock()
+        with pulsectl.Pulse("volume.neon") as pulse:
+            if pulse.stream_restore_test() is None:
+                raise RuntimeError("module-stream-restore is not loaded")
+
+    def set_streams(self, streams: Dict[str, dict]):
+        """
+        Apply stream levels to current and future streams with matching roles
+        :param streams: dict of stream name to `level` (0-100) and `muted`
+        """
+        entries = list()
+        for stream, roles in self.stream_roles.items():
+            if stream not in streams:
+                continue
+            for role in roles:
+                entries.append(pulsectl.PulseExtStreamRestoreInfo(
+                    f"sink-input-by-media-role:{role}", volume=streams[stream]["level"] / 100,
+                    mute=streams[stream]["muted"]))
+        if not entries:
+            return
+        with self._lock, pulsectl.Pulse("volume.neon") as pulse:
+            pulse.stream_restore_write(entries, mode="merge", apply_immediately=True)
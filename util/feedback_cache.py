@@ -0,0 +1,99 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from os import makedirs, replace
+from os.path import isfile, join
+from shutil import copyfile
+from threading import Lock
+from typing import Optional
+
+
+class FeedbackCache:
+    """
+    On-disk cache of pre-rendered confirmation audio, keyed by dialog and data
+    """
+    def __init__(self, cache_dir: str):
+        """
+        :param cache_dir: directory to store cached audio in
+        """
+        self.cache_dir = cache_dir
+        self._pending = set()
+        self._lock = Lock()
+
+    @staticmethod
+    def get_key(lang: str, dialog: str, data: dict) -> str:
+        """
+        Build a cache key for a rendered dialog
+        :param lang: language of the dialog
+        :param dialog: dialog file name
+        :param data: dialog data
+        :returns: string key safe to use as a file name
+        """
+        key = "_".join([lang, dialog] + [f"{k}-{data[k]}" for k in sorted(data)])
+        return re.sub(r"[^\w.-]", "_", key.lower())
+
+    def _get_path(self, key: str) -> str:
+        return join(self.cache_dir, f"{key}.wav")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        :param key: cache key
+        :returns: path to cached audio, None if not cached
+        """
+        path = self._get_path(key)
+        return path if isfile(path) else None
+
+    def claim(self, key: str) -> bool:
+        """
+        Mark key as being rendered so it is only rendered once
+        :param key: cache key
+        :returns: True if the caller should render key
+        """
+        with self._lock:
+            if key in self._pending or self.get(key):
+                return False
+            self._pending.add(key)
+            return True
+
+    def add(self, key: str, audio_file: Optional[str]):
+        """
+        Copy rendered audio into the cache and release the claim on key
+        :param key: cache key
+        :param audio_file: path to rendered audio, None if rendering failed
+        """
+        try:
+            if audio_file and isfile(audio_file):
+                makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = f"{self._get_path(key)}.tmp"
+                copyfile(audio_file, tmp_path)
+                replace(tmp_path, self._get_path(key))
+        finally:
+            with self._lock:
+                self._pending.discard(key)
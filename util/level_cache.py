@@ -0,0 +1,92 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+
+class LevelCache:
+    """
+    Thread-safe, in-process record of the last known input/output levels.
+    Entries expire after `ttl` seconds so that changes made outside of this
+    skill are eventually picked up again from the backend.
+    """
+    def __init__(self, ttl: float = 30.0):
+        """
+        :param ttl: seconds a cached level is considered valid (0 disables)
+        """
+        self.ttl = ttl
+        self._lock = Lock()
+        self._levels = dict()
+        self._updated = dict()
+
+    def get(self, io: str) -> Optional[int]:
+        """
+        Get the cached level for the requested io
+        :param io: "input" or "output"
+        :returns: cached level, None if unknown or stale
+        """
+        with self._lock:
+            if not self._is_fresh(io):
+                return None
+            return self._levels[io]
+
+    def update(self, io: str, level: int):
+        """
+        Record a known level for the requested io
+        :param io: "input" or "output"
+        :param level: current level (0-100)
+        """
+        with self._lock:
+            self._levels[io] = int(level)
+            self._updated[io] = monotonic()
+
+    def invalidate(self, io: Optional[str] = None):
+        """
+        Mark cached level(s) as stale
+        :param io: "input" or "output", None to invalidate everything
+        """
+        with self._lock:
+            if io:
+                self._updated.pop(io, None)
+            else:
+                self._updated.clear()
+
+    def is_fresh(self, io: str) -> bool:
+        """
+        :param io: "input" or "output"
+        :returns: True if a valid cached level exists for io
+        """
+        with self._lock:
+            return self._is_fresh(io)
+
+    def _is_fresh(self, io: str) -> bool:
+        if not self.ttl or self.ttl <= 0 or io not in self._updated:
+            return False
+        return monotonic() - self._updated[io] < self.ttl
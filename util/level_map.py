@@ -0,0 +1,121 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from typing import Tuple
+
+from .backends import VolumeBackend
+
+TAPERS = ("linear", "log")
+
+
+class LevelMap:
+    """
+    Converts between user-facing levels (0-100) and hardware volumes using
+    lookup tables computed once for a taper and hardware volume range.
+    With the "log" taper each user step is an equal change in dB.
+    """
+    def __init__(self, min_volume: int = 0, max_volume: int = 100,
+                 taper: str = "linear", db_range: float = 30.0):
+        """
+        :param min_volume: hardware volume for the lowest audible level
+        :param max_volume: hardware volume for level 100
+        :param taper: "linear" or "log"
+        :param db_range: dB between level 1 and level 100 for the log taper
+        """
+        self.min_volume = min_volume
+        self.max_volume = max(max_volume, min_volume)
+        self.taper = taper if taper in TAPERS else "linear"
+        self.db_range = db_range
+        self._to_volume = tuple(self._compute_volume(level) for level in range(101))
+        self._to_level = tuple(self._compute_level(volume) for volume in range(101))
+
+    def _exact_volume(self, level: int) -> float:
+        if level <= 0:
+            return 0.0
+        fraction = level / 100
+        if self.taper == "log":
+            fraction = 10 ** ((fraction - 1) * self.db_range / 20)
+        return self.min_volume + (self.max_volume - self.min_volume) * fraction
+
+    def _compute_volume(self, level: int) -> int:
+        return round(self._exact_volume(level))
+
+    def _compute_level(self, volume: int) -> int:
+        if volume <= 0:
+            return 0
+        # Prefer levels that produce this volume, so to_level(to_volume(level)) == level
+        # unless several levels share a volume; then pick the one closest before rounding
+        levels = [level for level in range(1, 101) if self._to_volume[level] == volume] or \
+            range(1, 101)
+        return min(levels, key=lambda level: abs(self._exact_volume(level) - volume))
+
+    def to_volume(self, level: int) -> int:
+        """
+        :param level: user-facing level (0-100)
+        :returns: hardware volume (0-100)
+        """
+        return self._to_volume[min(max(int(level), 0), 100)]
+
+    def to_level(self, volume: int) -> int:
+        """
+        :param volume: hardware volume (0-100)
+        :returns: user-facing level (0-100)
+        """
+        return self._to_level[min(max(int(volume), 0), 100)]
+
+
+class MappedBackend(VolumeBackend):
+    """
+    Wraps a VolumeBackend so output levels are converted through a LevelMap
+    """
+    def __init__(self, backend: VolumeBackend, level_map: LevelMap):
+        self.backend = backend
+        self.level_map = level_map
+        self.name = backend.name
+        self.min_step_interval = backend.min_step_interval
+        self.can_set_muted_level = backend.can_set_muted_level
+
+    def __getattr__(self, item):
+        return getattr(self.backend, item)
+
+    def get_levels(self) -> Tuple[int, int]:
+        mic_level, volume = self.backend.get_levels()
+        return mic_level, self.level_map.to_level(volume)
+
+    def set_level(self, io: str, setting: int):
+        if str(io) == "output" and int(setting) > 0:
+            setting = self.level_map.to_volume(setting)
+        self.backend.set_level(io, setting)
+
+    def set_muted_level(self, io: str, setting: int):
+        if str(io) == "output":
+            setting = self.level_map.to_volume(setting)
+        self.backend.set_muted_level(io, setting)
+
+    def shutdown(self):
+        self.backend.shutdown()
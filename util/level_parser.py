@@ -0,0 +1,226 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from functools import lru_cache
+from os import listdir
+from os.path import isdir, isfile, join
+from typing import Dict, List, Optional, Tuple
+from ovos_utils.log import LOG
+
+try:
+    from mycroft.util.parse import extract_number
+except ImportError:
+    extract_number = None
+
+# The last three lines of Level.voc are quiet/normal/loud
+_PRESET_COUNT = 3
+
+
+def _expand(line: str) -> List[str]:
+    """
+    Expand a vocab line like "(un|una)" or "fort|alt" into its alternatives
+    """
+    line = line.strip().lower().replace("(", "").replace(")", "")
+    return [word.strip() for word in line.split("|") if word.strip()]
+
+
+def _compile_words(words) -> Optional[re.Pattern]:
+    words = sorted(set(words), key=len, reverse=True)
+    if not words:
+        return None
+    return re.compile(r"(?<!\w)(" + "|".join(re.escape(w) for w in words) + r")(?!\w)")
+
+
+def _read_lines(path: str) -> List[str]:
+    if not isfile(path):
+        return list()
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    while lines and not lines[-1].strip():
+        lines.pop()
+    return [line for line in lines if not line.strip().startswith("#")]
+
+
+def normalize(utterance: str) -> str:
+    """
+    Normalize an utterance for parsing and caching
+    """
+    return " ".join(utterance.lower().split())
+
+
+class VolumeLevelParser:
+    """
+    Extracts volume levels from utterances using one language's vocab and
+    regex resources, compiled once and cached per normalized utterance.
+    """
+    def __init__(self, res_dir: str, lang: str, presets: Tuple[int, int, int],
+                 max_level: int = 100, cache_size: int = 256):
+        """
+        :param res_dir: skill directory containing `vocab` and `regex`
+        :param lang: language code of resources to load
+        :param presets: levels for the quiet, normal and loud Level words
+        :param max_level: level returned for MaxVolume phrases
+        :param cache_size: number of parsed utterances to cache
+        """
+        self.lang = lang
+        self.max_level = max_level
+        vocab_dir = join(res_dir, "vocab", lang)
+        self._levels: Dict[str, int] = dict()
+        self.presets = tuple(presets)
+        self._presets: Dict[str, int] = dict()
+        lines = _read_lines(join(vocab_dir, "Level.voc"))
+        preset_idx = [i for i, line in enumerate(lines) if line.strip()][-_PRESET_COUNT:]
+        for i, line in enumerate(lines):
+            for word in _expand(line):
+                if i in preset_idx:
+                    self._levels[word] = presets[preset_idx.index(i)]
+                    self._presets[word] = preset_idx.index(i)
+                elif word.isdigit():
+                    self._levels[word] = int(word)
+                # Number words are parsed with `extract_number`
+        self._level_words = _compile_words(self._presets.keys())
+        self._number = re.compile(r"(?<!\w)(\d+)(?!\w)")
+        self._percent = _compile_words(w for line in _read_lines(join(vocab_dir, "Percent.voc"))
+                                       for w in _expand(line))
+        self._max = _compile_words(w for line in _read_lines(join(vocab_dir, "MaxVolume.voc"))
+                                   for w in _expand(line))
+        self._to = _compile_words(w for line in _read_lines(join(vocab_dir, "To.voc"))
+                                  for w in _expand(line))
+        self._amount = list()
+        for line in _read_lines(join(res_dir, "regex", lang, "volume.amount.rx")):
+            try:
+                self._amount.append(re.compile(line.strip(), re.IGNORECASE))
+            except re.error as e:
+                LOG.error(f"Invalid regex in {lang}: {e}")
+        self._parse_level = lru_cache(maxsize=cache_size)(self._parse_level)
+        self._parse_delta = lru_cache(maxsize=cache_size)(self._parse_delta)
+
+    def _to_int(self, value: str, presets: Optional[Tuple[int, int, int]] = None) -> Optional[int]:
+        value = value.strip().lower()
+        if value.isdigit():
+            return int(value)
+        if presets and value in self._presets:
+            return presets[self._presets[value]]
+        return self._levels.get(value)
+
+    def _find_amount(self, utterance: str) -> Tuple[Optional[str], bool]:
+        """
+        Find the spoken amount in a normalized utterance
+        :returns: amount as spoken (None if not found), True if preceded by a To word
+        """
+        for pattern in self._amount:
+            match = pattern.search(utterance)
+            if match and match.groupdict().get("Level"):
+                after_to = bool(self._to and self._to.search(utterance[:match.start("Level")]))
+                return match.group("Level"), after_to
+        to_match = self._to.search(utterance) if self._to else None
+        spans = [(utterance[to_match.end():], True)] if to_match else []
+        spans.append((utterance, False))
+        for span, after_to in spans:
+            preset = self._level_words.search(span) if self._level_words else None
+            if preset:
+                return preset.group(1), after_to
+            number = self._extract_number(span)
+            if number is not None:
+                return str(number), after_to
+        return None, False
+
+    def _extract_number(self, text: str) -> Optional[int]:
+        """
+        Extract a number spoken as digits or words (i.e. "twenty five")
+        """
+        match = self._number.search(text)
+        if match:
+            return int(match.group(1))
+        if not extract_number:
+            return None
+        try:
+            number = extract_number(text, lang=self.lang)
+        except Exception as e:
+            LOG.debug(f"Failed to extract number from {text}: {e}")
+            return None
+        if number is False or number is None or number < 0:
+            return None
+        return round(number)
+
+    def _parse_level(self, utterance: str, level_str: Optional[str],
+                     presets: Tuple[int, int, int]) -> Optional[int]:
+        if self._max and self._max.search(utterance):
+            return self.max_level
+        word = level_str if level_str and self._to_int(level_str) is not None \
+            else self._find_amount(utterance)[0]
+        level = self._to_int(word, presets) if word else None
+        if level is None:
+            return None
+        if word not in self._presets and level <= 10 and \
+                not (self._percent and self._percent.search(utterance)):
+            # Translate 1-10 to 10-100 percent if level is numeric only
+            level = level * 10
+        return level
+
+    def _parse_delta(self, utterance: str) -> Optional[int]:
+        word, after_to = self._find_amount(utterance)
+        if word is None or after_to:
+            return None
+        return self._to_int(word)
+
+    def parse_level(self, utterance: str, level_str: Optional[str] = None,
+                    presets: Optional[Tuple[int, int, int]] = None) -> Optional[int]:
+        """
+        Parse an absolute level from an utterance
+        :param utterance: spoken request
+        :param level_str: `Level` entity matched by the intent parser, if any
+        :param presets: levels for quiet, normal and loud to use instead of the defaults
+        :returns: requested level (0-100) or None if no level was spoken
+        """
+        return self._parse_level(normalize(utterance),
+                                 normalize(str(level_str)) if level_str else None,
+                                 tuple(presets) if presets else self.presets)
+
+    def parse_delta(self, utterance: str) -> Optional[int]:
+        """
+        Parse a relative amount from an utterance like "turn it up by 20"
+        :param utterance: spoken request
+        :returns: amount to change by or None if no amount was spoken
+        """
+        return self._parse_delta(normalize(utterance))
+
+
+def load_parsers(res_dir: str, presets: Tuple[int, int, int],
+                 max_level: int = 100) -> Dict[str, VolumeLevelParser]:
+    """
+    Build a parser for every language with vocab in res_dir
+    :returns: dict of lang code to VolumeLevelParser
+    """
+    vocab_dir = join(res_dir, "vocab")
+    if not isdir(vocab_dir):
+        return dict()
+    return {lang: VolumeLevelParser(res_dir, lang, presets, max_level)
+            for lang in sorted(listdir(vocab_dir)) if isdir(join(vocab_dir, lang))}
@@ -0,0 +1,179 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Tuple
+
+from .backends import VolumeBackend
+
+# Upper bounds of histogram buckets in milliseconds
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.counts[bisect_left(BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def as_dict(self) -> dict:
+        buckets = {str(bound): count for bound, count in zip(BUCKETS_MS, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {"count": self.count,
+                "total_ms": round(self.total_ms, 3),
+                "max_ms": round(self.max_ms, 3),
+                "buckets": buckets}
+
+
+class VolumeMetrics:
+    """
+    Counters and latency histograms for volume operations. When disabled,
+    `timer` and `count` do nothing so instrumented code pays no cost.
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = Lock()
+        self._counters: Dict[str, int] = dict()
+        self._histograms: Dict[str, _Histogram] = dict()
+
+    def count(self, name: str, value: int = 1):
+        """
+        Increment a counter
+        :param name: counter name
+        :param value: amount to add
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, duration_ms: float):
+        """
+        Record a duration
+        :param name: histogram name
+        :param duration_ms: duration in milliseconds
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = _Histogram()
+            self._histograms[name].observe(duration_ms)
+
+    def timer(self, name: str):
+        """
+        Context manager that records the duration of its body
+        :param name: histogram name
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._timer(name)
+
+    @contextmanager
+    def _timer(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, 1000 * (perf_counter() - start))
+
+    def snapshot(self) -> dict:
+        """
+        :returns: dict of current counters and histograms
+        """
+        with self._lock:
+            return {"enabled": self.enabled,
+                    "counters": dict(self._counters),
+                    "histograms": {name: hist.as_dict()
+                                   for name, hist in self._histograms.items()}}
+
+    def reset(self):
+        """
+        Clear all recorded metrics
+        """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def timed(name: str):
+    """
+    Decorator recording the duration of a method in `self._metrics`
+    :param name: histogram name
+    """
+    def wrapper(func):
+        @wraps(func)
+        def _timed(self, *args, **kwargs):
+            with self._metrics.timer(name):
+                return func(self, *args, **kwargs)
+        return _timed
+    return wrapper
+
+
+class InstrumentedBackend(VolumeBackend):
+    """
+    Wraps a VolumeBackend to record timing for every call
+    """
+    def __init__(self, backend: VolumeBackend, metrics: VolumeMetrics):
+        self.backend = backend
+        self.metrics = metrics
+        self.name = backend.name
+        self.min_step_interval = backend.min_step_interval
+        self.can_set_muted_level = backend.can_set_muted_level
+
+    def __getattr__(self, item):
+        return getattr(self.backend, item)
+
+    def get_levels(self) -> Tuple[int, int]:
+        self.metrics.count(f"backend.{self.name}.get_levels")
+        with self.metrics.timer(f"backend.{self.name}.get_levels"):
+            return self.backend.get_levels()
+
+    def set_level(self, io: str, setting: int):
+        self.metrics.count(f"backend.{self.name}.set_level")
+        with self.metrics.timer(f"backend.{self.name}.set_level"):
+            self.backend.set_level(io, setting)
+
+    def set_muted_level(self, io: str, setting: int):
+        self.metrics.count(f"backend.{self.name}.set_muted_level")
+        with self.metrics.timer(f"backend.{self.name}.set_muted_level"):
+            self.backend.set_muted_level(io, setting)
+
+    def shutdown(self):
+        self.backend.shutdown()
@@ -0,0 +1,91 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+
+# Profile entries that apply to any user or no specific context
+ANY = "*"
+PROFILE_FIELDS = ("quiet", "normal", "loud", "default_level", "offset")
+
+
+class VolumeProfiles:
+    """
+    In-memory index of volume profiles keyed by user and context. Profiles
+    are merged from least to most specific: base, any user, the user, then
+    each active context for any user and for the user.
+    """
+    def __init__(self, profiles: Optional[Iterable[dict]] = None, base: Optional[dict] = None):
+        """
+        :param profiles: list of dicts with optional `user` and `context` keys
+                         and any of PROFILE_FIELDS
+        :param base: default values for PROFILE_FIELDS
+        """
+        self._lock = Lock()
+        self._index: Dict[Tuple[str, str], dict] = dict()
+        self._resolved: Dict[Tuple[str, Tuple[str, ...]], dict] = dict()
+        self._base = dict()
+        self.load(profiles or [], base or dict())
+
+    def load(self, profiles: Iterable[dict], base: dict):
+        """
+        Rebuild the index from profile definitions
+        :param profiles: list of profile dicts
+        :param base: default values for PROFILE_FIELDS
+        """
+        index = dict()
+        for profile in profiles:
+            if not isinstance(profile, dict):
+                continue
+            key = (str(profile.get("user") or ANY), str(profile.get("context") or ANY))
+            values = {k: profile[k] for k in PROFILE_FIELDS if profile.get(k) is not None}
+            index.setdefault(key, dict()).update(values)
+        with self._lock:
+            self._base = {k: base[k] for k in PROFILE_FIELDS if base.get(k) is not None}
+            self._index = index
+            self._resolved = dict()
+
+    def resolve(self, user: Optional[str], contexts: Tuple[str, ...] = ()) -> dict:
+        """
+        Get the merged profile for a user in the given contexts
+        :param user: username, None for any user
+        :param contexts: active contexts, least to most specific
+        :returns: dict of PROFILE_FIELDS values
+        """
+        user = user or ANY
+        key = (user, tuple(contexts))
+        with self._lock:
+            resolved = self._resolved.get(key)
+            if resolved is None:
+                resolved = dict(self._base)
+                for context in (ANY,) + key[1]:
+                    resolved.update(self._index.get((ANY, context), {}))
+                    if user != ANY:
+                        resolved.update(self._index.get((user, context), {}))
+                self._resolved[key] = resolved
+            return resolved
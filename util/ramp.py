@@ -0,0 +1,173 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from math import log10
+from threading import Condition, Thread
+from time import monotonic
+from typing import Callable, Dict, List, Optional
+from ovos_utils.log import LOG
+
+# Quietest gain used for dB interpolation; level 0 maps here
+_MIN_DB = -60.0
+
+
+def _level_to_db(level: float) -> float:
+    if level <= 0:
+        return _MIN_DB
+    return max(20 * log10(level / 100), _MIN_DB)
+
+
+def _db_to_level(db: float) -> float:
+    if db <= _MIN_DB:
+        return 0
+    return 100 * 10 ** (db / 20)
+
+
+def ramp_levels(start: int, end: int, steps: int, curve: str = "db") -> List[int]:
+    """
+    Build the list of levels to step through between two levels
+    :param start: level to ramp from (0-100)
+    :param end: level to ramp to (0-100)
+    :param steps: maximum number of steps to take
+    :param curve: "linear" or "db" for perceptually even steps
+    :returns: list of distinct levels ending with `end`
+    """
+    steps = max(int(steps), 1)
+    levels = list()
+    for i in range(1, steps + 1):
+        fraction = i / steps
+        if curve == "db":
+            start_db, end_db = _level_to_db(start), _level_to_db(end)
+            level = _db_to_level(start_db + (end_db - start_db) * fraction)
+        else:
+            level = start + (end - start) * fraction
+        level = round(level)
+        if level != start and (not levels or level != levels[-1]):
+            levels.append(level)
+    if not levels or levels[-1] != end:
+        levels.append(end)
+    return levels
+
+
+class _Ramp:
+    def __init__(self, levels: List[int], interval: float,
+                 on_complete: Optional[Callable[[], None]]):
+        self.levels = levels
+        self.interval = interval
+        self.on_complete = on_complete
+        self.index = 0
+        self.next_time = monotonic()
+        self.current = None
+
+
+class VolumeRamper:
+    """
+    Steps levels over time from a single timer thread. Starting a new ramp
+    for an io replaces any ramp already in progress for it.
+    """
+    def __init__(self, apply_level: Callable[[str, int], None]):
+        """
+        :param apply_level: method applying a level to an io
+        """
+        self._apply_level = apply_level
+        self._ramps: Dict[str, _Ramp] = dict()
+        self._cond = Condition()
+        self._running = True
+        self._thread = Thread(target=self._run, name="VolumeRamper", daemon=True)
+        self._thread.start()
+
+    def start(self, io: str, levels: List[int], interval: float,
+              on_complete: Optional[Callable[[], None]] = None):
+        """
+        Start ramping io through levels
+        :param io: "input" or "output"
+        :param levels: levels to apply, in order
+        :param interval: seconds between steps
+        :param on_complete: optional method to call after the last step
+        """
+        with self._cond:
+            self._ramps[io] = _Ramp(levels, interval, on_complete)
+            self._cond.notify()
+
+    def cancel(self, io: str):
+        """
+        Stop any ramp in progress for io, leaving it at its current step
+        :param io: "input" or "output"
+        """
+        with self._cond:
+            self._ramps.pop(io, None)
+
+    def current_level(self, io: str) -> Optional[int]:
+        """
+        :param io: "input" or "output"
+        :returns: last level applied by an active ramp, else None
+        """
+        with self._cond:
+            ramp = self._ramps.get(io)
+            return ramp.current if ramp else None
+
+    def shutdown(self):
+        """
+        Cancel all ramps and stop the timer thread
+        """
+        with self._cond:
+            self._running = False
+            self._ramps.clear()
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                now = monotonic()
+                steps = list()
+                for io, ramp in list(self._ramps.items()):
+                    if ramp.next_time > now:
+                        continue
+                    level = ramp.levels[ramp.index]
+                    ramp.index += 1
+                    ramp.current = level
+                    ramp.next_time = now + ramp.interval
+                    done = ramp.index >= len(ramp.levels)
+                    if done:
+                        self._ramps.pop(io)
+                    steps.append((io, level, ramp.on_complete if done else None))
+                if not steps:
+                    timeout = min(r.next_time for r in self._ramps.values()) - now \
+                        if self._ramps else None
+                    self._cond.wait(timeout)
+                    continue
+            for io, level, on_complete in steps:
+                try:
+                    self._apply_level(io, level)
+                    if on_complete:
+                        on_complete()
+                except Exception as e:
+                    LOG.error(e)
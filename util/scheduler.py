@@ -0,0 +1,148 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from concurrent.futures import Future
+from threading import Condition, Thread
+from time import monotonic
+from typing import Callable, Dict, Optional
+from ovos_utils.log import LOG
+
+
+class _PendingChange:
+    def __init__(self, deadline: float, expires: float):
+        self.level = None
+        self.delta = 0
+        self.deadline = deadline
+        self.expires = expires
+        self.futures = list()
+        self.kwargs = dict()
+
+
+class VolumeChangeScheduler:
+    """
+    Merges volume changes requested within a short window into a single
+    backend write. All reads and writes for scheduled changes happen on one
+    worker thread so concurrent requests can't interleave read-modify-write.
+    """
+    def __init__(self, get_level: Callable[[str], int],
+                 apply_level: Callable[..., None],
+                 window: float = 0.1, min_level: int = 0, max_level: int = 100):
+        """
+        :param get_level: method returning the current level for an io
+        :param apply_level: method applying a level to an io, accepting
+            any kwargs passed to `submit`
+        :param window: seconds to wait for more changes before applying
+        :param min_level: minimum level to apply
+        :param max_level: maximum level to apply
+        """
+        self._get_level = get_level
+        self._apply_level = apply_level
+        self.window = max(window, 0)
+        self.min_level = min_level
+        self.max_level = max_level
+        self._pending: Dict[str, _PendingChange] = dict()
+        self._cond = Condition()
+        self._running = True
+        self._thread = Thread(target=self._run, name="VolumeChangeScheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, io: str, delta: int = 0, level: Optional[int] = None,
+               **kwargs) -> Future:
+        """
+        Schedule a volume change. An absolute level replaces any pending
+        change for io; a delta is added to what is already pending.
+        :param io: "input" or "output"
+        :param delta: relative change to apply
+        :param level: absolute level to apply
+        :param kwargs: passed to `apply_level`; the latest values submitted win
+        :returns: Future resolving to a tuple of (old_level, new_level)
+        """
+        future = Future()
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("Scheduler is shut down")
+            now = monotonic()
+            pending = self._pending.get(io)
+            if not pending:
+                pending = _PendingChange(now + self.window, now + 4 * self.window)
+                self._pending[io] = pending
+            else:
+                pending.deadline = min(now + self.window, pending.expires)
+            if level is not None:
+                pending.level = level
+                pending.delta = 0
+            else:
+                pending.delta += delta
+            pending.futures.append(future)
+            pending.kwargs.update(kwargs)
+            self._cond.notify()
+        return future
+
+    def shutdown(self):
+        """
+        Apply any pending changes and stop the worker thread
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join()
+
+    def _bound(self, level: int) -> int:
+        return min(max(level, self.min_level), self.max_level)
+
+    def _apply(self, io: str, pending: _PendingChange):
+        try:
+            old_level = self._get_level(io)
+            new_level = pending.level if pending.level is not None else old_level
+            new_level = self._bound(new_level + pending.delta)
+            self._apply_level(io, new_level, **pending.kwargs)
+            result = (old_level, new_level)
+            for future in pending.futures:
+                future.set_result(result)
+        except Exception as e:
+            LOG.error(e)
+            for future in pending.futures:
+                future.set_exception(e)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                now = monotonic()
+                due = {io: change for io, change in self._pending.items()
+                       if change.deadline <= now or not self._running}
+                for io in due:
+                    self._pending.pop(io)
+                if not due:
+                    if not self._running:
+                        return
+                    timeout = min(c.deadline for c in self._pending.values()) - now \
+                        if self._pending else None
+                    self._cond.wait(timeout)
+                    continue
+            for io, change in due.items():
+                self._apply(io, change)
@@ -0,0 +1,136 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+from os import makedirs, replace
+from os.path import dirname, isfile
+from tempfile import NamedTemporaryFile
+from threading import Lock, Timer
+from typing import Any, Callable
+from ovos_utils.log import LOG
+
+
+class VolumeStateStore:
+    """
+    Persists the last known levels and mute state to a JSON file. Updates
+    are held in memory and written atomically after `debounce` seconds so
+    bursts of changes result in a single write.
+    """
+    def __init__(self, path: str, debounce: float = 1.0):
+        """
+        :param path: path to the JSON file to persist state to
+        :param debounce: seconds to wait for more updates before writing
+        """
+        self.path = path
+        self.debounce = debounce
+        self._lock = Lock()
+        self._timer = None
+        self._providers = dict()
+        self._state = self._read()
+
+    def _read(self) -> dict:
+        if not isfile(self.path):
+            return dict()
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else dict()
+        except Exception as e:
+            LOG.error(f"Failed to read volume state: {e}")
+            return dict()
+
+    def get(self, key: str, default=None):
+        """
+        Get a persisted value
+        :param key: state key to get
+        :param default: value to return if key is not set
+        """
+        with self._lock:
+            return self._state.get(key, default)
+
+    def update(self, **kwargs):
+        """
+        Update persisted values and schedule a write to disk
+        """
+        with self._lock:
+            if all(self._state.get(k) == v for k, v in kwargs.items()):
+                return
+            self._state.update(kwargs)
+            self._schedule_write()
+
+    def set_provider(self, key: str, provider: Callable[[], Any]):
+        """
+        Persist the value returned by provider for key. The provider is only
+        called when state is written, so large values are cheap to update.
+        :param key: state key to persist
+        :param provider: method returning the current value for key
+        """
+        with self._lock:
+            self._providers[key] = provider
+
+    def touch(self):
+        """
+        Schedule a write to disk after a provided value changed
+        """
+        with self._lock:
+            self._schedule_write()
+
+    def _schedule_write(self):
+        if self._timer:
+            self._timer.cancel()
+        self._timer = Timer(self.debounce, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """
+        Write any pending state to disk immediately
+        """
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            providers = dict(self._providers)
+        for key, provider in providers.items():
+            try:
+                value = provider()
+                with self._lock:
+                    self._state[key] = value
+            except Exception as e:
+                LOG.error(f"Failed to get {key}: {e}")
+        with self._lock:
+            state = dict(self._state)
+        try:
+            makedirs(dirname(self.path), exist_ok=True)
+            with NamedTemporaryFile("w", dir=dirname(self.path), delete=False,
+                                    suffix=".tmp") as f:
+                json.dump(state, f, indent=2)
+            replace(f.name, self.path)
+        except Exception as e:
+            LOG.error(f"Failed to write volume state: {e}")
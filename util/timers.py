@@ -0,0 +1,151 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2022 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import heapq
+
+from itertools import count
+from threading import Condition, Thread
+from time import time
+from typing import Callable, Dict, List, Optional
+from ovos_utils.log import LOG
+
+
+class VolumeTimers:
+    """
+    Pending timed actions (i.e. "unmute in 10 minutes") kept in one heap and
+    serviced by a single thread, so any number of timers costs one thread
+    and O(log n) per change. Due times are wall-clock so pending timers can
+    be saved and restored across restarts.
+    """
+    def __init__(self, on_expired: Callable[[dict], None],
+                 on_changed: Optional[Callable[[], None]] = None,
+                 timers: Optional[List[dict]] = None):
+        """
+        :param on_expired: method called with a timer's data when it is due
+        :param on_changed: method called when pending timers change
+        :param timers: previously saved timers to restore
+        """
+        self._on_expired = on_expired
+        self._on_changed = on_changed
+        self._timers: Dict[str, dict] = dict()
+        self._heap = list()
+        self._seq = count()
+        self._cond = Condition()
+        self._running = True
+        for timer in timers or []:
+            try:
+                self._add(str(timer["id"]), float(timer["due"]), dict(timer["data"]))
+            except (KeyError, TypeError, ValueError) as e:
+                LOG.warning(f"Ignoring invalid timer {timer}: {e}")
+        self._thread = Thread(target=self._run, name="VolumeTimers", daemon=True)
+        self._thread.start()
+
+    def _add(self, timer_id: str, due: float, data: dict):
+        self._timers[timer_id] = {"id": timer_id, "due": due, "data": data}
+        heapq.heappush(self._heap, (due, next(self._seq), timer_id))
+
+    def schedule(self, timer_id: str, delay: float, data: dict):
+        """
+        Schedule an action, replacing any pending timer with the same ID
+        :param timer_id: unique ID for this timer
+        :param delay: seconds until the timer is due
+        :param data: serializable data passed to `on_expired`
+        """
+        with self._cond:
+            self._add(timer_id, time() + delay, data)
+            self._cond.notify()
+        self._notify_changed()
+
+    def cancel(self, timer_id: str) -> bool:
+        """
+        Cancel a pending timer
+        :param timer_id: ID of timer to cancel
+        :returns: True if a timer was cancelled
+        """
+        with self._cond:
+            # Heap entries for removed timers are skipped when they come due
+            cancelled = self._timers.pop(timer_id, None) is not None
+        if cancelled:
+            self._notify_changed()
+        return cancelled
+
+    def get(self, timer_id: str) -> Optional[dict]:
+        """
+        :param timer_id: ID of timer to get
+        :returns: pending timer with `id`, `due` and `data`, None if not pending
+        """
+        with self._cond:
+            timer = self._timers.get(timer_id)
+            return dict(timer) if timer else None
+
+    def get_timers(self) -> List[dict]:
+        """
+        :returns: list of pending timers with `id`, `due` and `data`
+        """
+        with self._cond:
+            return [dict(timer) for timer in self._timers.values()]
+
+    def shutdown(self):
+        """
+        Stop servicing timers; pending timers are left for `get_timers`
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join()
+
+    def _notify_changed(self):
+        if self._on_changed:
+            self._on_changed()
+
+    def _pop_due(self, now: float) -> List[dict]:
+        due = list()
+        while self._heap and self._heap[0][0] <= now:
+            due_time, _, timer_id = heapq.heappop(self._heap)
+            timer = self._timers.get(timer_id)
+            # Skip entries for timers that were cancelled or rescheduled
+            if timer and timer["due"] == due_time:
+                due.append(self._timers.pop(timer_id))
+        return due
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                expired = self._pop_due(time())
+                if not expired:
+                    timeout = self._heap[0][0] - time() if self._heap else None
+                    self._cond.wait(timeout)
+                    continue
+            for timer in expired:
+                try:
+                    self._on_expired(timer["data"])
+                except Exception as e:
+                    LOG.error(e)
+            self._notify_changed()